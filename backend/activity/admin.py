@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from core.paginator import EstimatedCountPaginator
+from .models import ActivityEntry
+
+
+@admin.register(ActivityEntry)
+class ActivityEntryAdmin(admin.ModelAdmin):
+    list_display = ("object_type", "object_id", "action", "actor", "created_at")
+    list_select_related = ("actor",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_filter = ("object_type", "action")
+    raw_id_fields = ("actor",)
@@ -0,0 +1,82 @@
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from django.db import models
+
+from .models import ActivityEntry
+
+# Entries recorded during the current request, flushed by ActivityLogMiddleware
+_pending: ContextVar[Optional[List[ActivityEntry]]] = ContextVar("activity_pending", default=None)
+
+
+def object_type(model) -> str:
+    return model._meta.model_name
+
+
+def tracked_values(instance: models.Model) -> Dict[str, Any]:
+    """Current values of the instance's user-editable fields, keyed by field name."""
+
+    return {
+        field.name: field.value_from_object(instance)
+        for field in instance._meta.concrete_fields
+        if field.editable and not field.primary_key
+    }
+
+
+def diff(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, List[Any]]:
+    return {name: [before[name], value] for name, value in after.items() if before.get(name) != value}
+
+
+def record(instance: models.Model, actor, action: str, changes: Optional[Dict[str, List[Any]]] = None) -> None:
+    """Queue an activity entry for `instance`.
+
+    Inside a request the entry waits in the request buffer; elsewhere (management
+    commands, shells) it is written straight away.
+    """
+
+    entry = ActivityEntry(
+        object_type=object_type(type(instance)),
+        object_id=instance.pk,
+        actor=actor if actor and actor.is_authenticated else None,
+        action=action,
+        changes=changes or {},
+    )
+    pending = _pending.get()
+    if pending is None:
+        entry.save()
+    else:
+        pending.append(entry)
+
+
+def record_created(instance: models.Model, actor) -> None:
+    record(instance, actor, ActivityEntry.Action.CREATED)
+
+
+def record_updated(instance: models.Model, actor, before: Dict[str, Any]) -> None:
+    changes = diff(before, tracked_values(instance))
+    if changes:
+        record(instance, actor, ActivityEntry.Action.UPDATED, changes)
+
+
+def start_buffer():
+    return _pending.set([])
+
+
+def take_buffer(token) -> List[ActivityEntry]:
+    """Reset the buffer and return what it held; must run in the context that started it."""
+
+    pending = _pending.get() or []
+    _pending.reset(token)
+    return pending
+
+
+def write_entries(entries: List[ActivityEntry]) -> int:
+    if entries:
+        ActivityEntry.objects.bulk_create(entries)
+    return len(entries)
+
+
+def flush_buffer(token) -> int:
+    """Write the buffered entries with a single INSERT and reset the buffer."""
+
+    return write_entries(take_buffer(token))
@@ -0,0 +1,34 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .log import flush_buffer, start_buffer, take_buffer, write_entries
+
+
+class ActivityLogMiddleware:
+    """Collect activity entries recorded while handling a request and insert them
+    together once the response is ready, instead of one INSERT per change."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = start_buffer()
+        try:
+            return self.get_response(request)
+        finally:
+            flush_buffer(token)
+
+    async def __acall__(self, request):
+        token = start_buffer()
+        try:
+            return await self.get_response(request)
+        finally:
+            # sync_to_async runs in a copy of this context, so reset the buffer here
+            await sync_to_async(write_entries)(take_buffer(token))
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:34
+
+import activity.models
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(max_length=32)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated')], max_length=16)),
+                ('changes', models.JSONField(blank=True, default=dict, encoder=activity.models.CompactJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'activity entries',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['object_type', 'object_id', 'id'], name='activity_ac_object__c849e7_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class CompactJSONEncoder(DjangoJSONEncoder):
+    """JSON without the default `", "`/`": "` padding, to keep diff rows small."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs["separators"] = (",", ":")
+        super().__init__(*args, **kwargs)
+
+
+class ActivityEntry(models.Model):
+    """Append-only audit record of a change to a task or project.
+
+    `changes` maps each modified field to `[old, new]`; foreign keys are stored as
+    ids. Rows are never updated, and are written in one batch per request by
+    `activity.middleware.ActivityLogMiddleware`.
+    """
+
+    class Action(models.TextChoices):
+        CREATED = "created", "Created"
+        UPDATED = "updated", "Updated"
+
+    object_type = models.CharField(max_length=32)
+    object_id = models.PositiveBigIntegerField()
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    action = models.CharField(max_length=16, choices=Action.choices)
+    changes = models.JSONField(default=dict, blank=True, encoder=CompactJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        verbose_name_plural = "activity entries"
+        indexes = [models.Index(fields=["object_type", "object_id", "id"])]
+
+    def __str__(self) -> str:
+        return f"{self.object_type} {self.object_id} {self.action}"
@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+from .models import ActivityEntry
+
+
+class ActivityEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ActivityEntry
+        fields = ["id", "action", "actor", "changes", "created_at"]
+        read_only_fields = fields
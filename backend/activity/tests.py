@@ -0,0 +1,86 @@
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from projects.models import Project, ProjectMembership
+from tasks.models import Task
+from .log import _pending, record
+from .middleware import ActivityLogMiddleware
+from .models import ActivityEntry
+
+
+class ActivityLogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.project = Project.objects.create(name="Project", created_by=cls.user)
+        ProjectMembership.objects.create(project=cls.project, user=cls.user, role=ProjectMembership.Role.COLLABORATOR)
+        cls.task = Task.objects.create(project=cls.project, name="Task", created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_update_records_only_the_changed_fields(self):
+        url = reverse("task-detail", args=[self.task.pk])
+        response = self.client.patch(url, {"name": "Renamed", "status": Task.Status.PENDING}, format="json")
+        self.assertEqual(response.status_code, 200)
+        entry = ActivityEntry.objects.get(object_type="task", object_id=self.task.pk)
+        self.assertEqual(entry.action, ActivityEntry.Action.UPDATED)
+        self.assertEqual(entry.actor, self.user)
+        self.assertEqual(entry.changes, {"name": ["Task", "Renamed"]})
+
+        # Saving the same values again leaves no entry
+        self.client.patch(url, {"name": "Renamed"}, format="json")
+        self.assertEqual(ActivityEntry.objects.count(), 1)
+
+    def test_entries_of_a_request_are_written_with_one_insert(self):
+        def view(request):
+            for name in ("a", "b", "c"):
+                record(self.task, self.user, ActivityEntry.Action.UPDATED, {"name": ["Task", name]})
+            return HttpResponse()
+
+        with CaptureQueriesContext(connection) as queries:
+            ActivityLogMiddleware(view)(RequestFactory().get("/"))
+        inserts = [query for query in queries if query["sql"].startswith('INSERT INTO "activity_activityentry"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(ActivityEntry.objects.count(), 3)
+        self.assertIsNone(_pending.get())
+
+    async def test_async_requests_flush_and_reset_the_buffer(self):
+        async def view(request):
+            record(self.task, self.user, ActivityEntry.Action.CREATED)
+            return HttpResponse()
+
+        response = await ActivityLogMiddleware(view)(RequestFactory().get("/"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(await ActivityEntry.objects.acount(), 1)
+        self.assertIsNone(_pending.get())
+
+    def test_history_pages_with_cursors(self):
+        ActivityEntry.objects.bulk_create(
+            [
+                ActivityEntry(object_type="task", object_id=self.task.pk, action=ActivityEntry.Action.UPDATED)
+                for _ in range(5)
+            ]
+        )
+        ActivityEntry.objects.create(object_type="project", object_id=self.task.pk, action="created")
+        ids = list(ActivityEntry.objects.filter(object_type="task").values_list("id", flat=True))
+        url = reverse("task-history", args=[self.task.pk])
+
+        page = self.client.get(url, {"limit": 2}).data
+        self.assertEqual([entry["id"] for entry in page["results"]], ids[3:])
+        self.assertIsNone(page["after"])
+        page = self.client.get(url, {"limit": 2, "before": page["before"]}).data
+        self.assertEqual([entry["id"] for entry in page["results"]], ids[1:3])
+        page = self.client.get(url, {"limit": 2, "before": page["before"]}).data
+        self.assertEqual([entry["id"] for entry in page["results"]], ids[:1])
+        self.assertIsNone(page["before"])
+        page = self.client.get(url, {"limit": 2, "after": page["after"]}).data
+        self.assertEqual([entry["id"] for entry in page["results"]], ids[1:3])
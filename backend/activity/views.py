@@ -0,0 +1,25 @@
+from rest_framework.decorators import action
+
+from core.pagination import KeysetPagination
+from .log import object_type
+from .models import ActivityEntry
+from .serializers import ActivityEntrySerializer
+
+
+class ActivityPagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class ActivityHistoryMixin:
+    """Adds a `history` detail action listing the object's activity entries.
+
+    Paged with a keyset cursor over the `(object_type, object_id, id)` index.
+    """
+
+    @action(detail=True, methods=["get"])
+    def history(self, request, pk=None):
+        instance = self.get_object()
+        entries = ActivityEntry.objects.filter(object_type=object_type(type(instance)), object_id=instance.pk)
+        paginator = ActivityPagination()
+        page = paginator.paginate_queryset(entries, request, view=self)
+        return paginator.get_paginated_response(ActivityEntrySerializer(page, many=True).data)
@@ -0,0 +1,25 @@
+import time
+
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from core import metrics
+
+
+class TimedJWTAuthentication(JWTAuthentication):
+    """`JWTAuthentication` that records how long decoding and the user lookup take."""
+
+    def authenticate(self, request):
+        started, result = time.perf_counter(), "failed"
+        try:
+            user_auth = super().authenticate(request)
+            result = "ok" if user_auth else "anonymous"
+            return user_auth
+        finally:
+            metrics.auth_duration.observe(time.perf_counter() - started, backend="jwt", result=result)
+
+
+class TimedJWTScheme(SimpleJWTScheme):
+    """Document `TimedJWTAuthentication` as the same bearer scheme in the OpenAPI schema."""
+
+    target_class = "authentication.backends.TimedJWTAuthentication"
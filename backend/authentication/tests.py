@@ -1,3 +1,52 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from core.idempotency import cache_key
+from .models import User
+
+
+class RegisterIdempotencyTests(TestCase):
+    payload = {
+        "username": "newcomer",
+        "email": "newcomer@example.com",
+        "password": "Sup3r-secret-pw!",
+        "password2": "Sup3r-secret-pw!",
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def register(self, key, **overrides):
+        return self.client.post(
+            reverse("register"), {**self.payload, **overrides}, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retry_replays_with_fresh_tokens_and_no_credentials_in_the_cache(self):
+        first = self.register("signup-1")
+        retry = self.register("signup-1")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(User.objects.filter(username="newcomer").count(), 1)
+        self.assertEqual(retry.data["user"], first.data["user"])
+        self.assertNotEqual(retry.data["refresh"], first.data["refresh"])
+        self.assertEqual(AccessToken(retry.data["access"])["user_id"], first.data["user"]["id"])
+
+        stored = cache.get(cache_key("anon", "POST", reverse("register"), "signup-1"))
+        self.assertEqual(stored["data"], {"user": first.data["user"]["id"]})
+
+    def test_key_reused_with_another_body_is_rejected(self):
+        self.register("signup-1")
+        response = self.register("signup-1", username="someone-else", email="else@example.com")
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(User.objects.filter(username="someone-else").exists())
+
+    def test_failed_registration_is_not_stored(self):
+        User.objects.create_user(username="newcomer", password="pass1234")
+        self.assertEqual(self.register("signup-1").status_code, 400)
+        self.assertIsNone(cache.get(cache_key("anon", "POST", reverse("register"), "signup-1")))
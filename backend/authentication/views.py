@@ -1,16 +1,38 @@
 from rest_framework import permissions, status
-from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.decorators import api_view, permission_classes, parser_classes, throttle_classes
 from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
 
+from core.idempotency import idempotent
+from core.throttling import RegisterRateThrottle
+from .models import User
 from .serializers import RegisterSerializer, UserSerializer
 
 
+def registration_payload(user) -> dict:
+    # Tokens are issued on registration to streamline UX
+    refresh = RefreshToken.for_user(user)
+    return {
+        "user": UserSerializer(user).data,
+        "access": str(refresh.access_token),
+        "refresh": str(refresh),
+    }
+
+
+def replay_registration(stored: dict):
+    # Replays get fresh tokens; only the new user's id is kept in the cache
+    user = User.objects.filter(pk=stored["user"]).first()
+    return registration_payload(user) if user is not None else None
+
+
 @api_view(["POST"])
 @permission_classes([permissions.AllowAny])
 @parser_classes([JSONParser, FormParser, MultiPartParser])
+@throttle_classes([RegisterRateThrottle])
+@idempotent(dump=lambda response: {"user": response.data["user"]["id"]}, load=replay_registration)
 def register_view(request):
     """Register a new user (default role: viewer).
 
@@ -23,15 +45,13 @@ def register_view(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     user = serializer.save()
+    return Response(registration_payload(user), status=status.HTTP_201_CREATED)
 
-    # Optionally issue JWT tokens on registration to streamline UX
-    refresh = RefreshToken.for_user(user)
-    payload = {
-        "user": UserSerializer(user).data,
-        "access": str(refresh.access_token),
-        "refresh": str(refresh),
-    }
-    return Response(payload, status=status.HTTP_201_CREATED)
+
+class LoginView(TokenObtainPairView):
+    """Obtain a JWT pair; throttled separately to slow down credential stuffing."""
+
+    throttle_scope = "login"
 
 
 class MeView(APIView):
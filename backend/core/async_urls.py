@@ -0,0 +1,39 @@
+from django.urls import path
+
+from notifications.serializers import NotificationSerializer
+from notifications.views import NotificationViewSet
+from projects.serializers import ProjectSerializer
+from projects.views import ProjectViewSet
+from tasks.serializers import TaskSerializer
+from tasks.views import TaskViewSet
+from .async_views import AsyncDetailView, AsyncListView, AsyncMeView
+
+# Async mirrors of the hottest read endpoints, intended to be served under ASGI
+urlpatterns = [
+    path("auth/me/", AsyncMeView.as_view(), name="async-me"),
+    path(
+        "projects/",
+        AsyncListView.as_view(viewset_class=ProjectViewSet, serializer_class=ProjectSerializer),
+        name="async-project-list",
+    ),
+    path(
+        "projects/<int:pk>/",
+        AsyncDetailView.as_view(viewset_class=ProjectViewSet, serializer_class=ProjectSerializer),
+        name="async-project-detail",
+    ),
+    path(
+        "tasks/",
+        AsyncListView.as_view(viewset_class=TaskViewSet, serializer_class=TaskSerializer),
+        name="async-task-list",
+    ),
+    path(
+        "tasks/<int:pk>/",
+        AsyncDetailView.as_view(viewset_class=TaskViewSet, serializer_class=TaskSerializer),
+        name="async-task-detail",
+    ),
+    path(
+        "notifications/",
+        AsyncListView.as_view(viewset_class=NotificationViewSet, serializer_class=NotificationSerializer),
+        name="async-notification-list",
+    ),
+]
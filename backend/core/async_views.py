@@ -0,0 +1,138 @@
+import asyncio
+import time
+from typing import Any, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage, Paginator
+from django.db import close_old_connections
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from authentication.models import User
+from authentication.serializers import UserSerializer
+from . import metrics
+
+
+async def run_concurrently(*funcs: Callable[[], Any]) -> list:
+    """Run independent blocking ORM callables at the same time.
+
+    Django's async ORM calls share one thread per request, so `asyncio.gather` over
+    them would still run the queries one after another. Each callable here gets its
+    own executor thread (and therefore its own database connection).
+    """
+
+    def call(func):
+        try:
+            return func()
+        finally:
+            close_old_connections()
+
+    return await asyncio.gather(*(sync_to_async(call, thread_sensitive=False)(func) for func in funcs))
+
+
+class AsyncReadView(View):
+    """Base for async, read-only JSON endpoints served under ASGI.
+
+    Authenticates with the same JWT settings as the DRF views and reuses a viewset's
+    `get_queryset` so visibility rules stay in one place. Lists use the viewset's
+    default `ordering`; filtering, search and other orderings remain on the
+    synchronous endpoints.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    viewset_class = None
+    serializer_class = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        started, result = time.perf_counter(), "failed"
+        try:
+            request.user = await self.authenticate(request)
+            result = "ok" if request.user else "anonymous"
+        except (AuthenticationFailed, TokenError, User.DoesNotExist):
+            return JsonResponse({"detail": "Given token not valid for any token type"}, status=401)
+        finally:
+            metrics.auth_duration.observe(time.perf_counter() - started, backend="jwt", result=result)
+        if request.user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def authenticate(self, request):
+        auth = JWTAuthentication()
+        header = auth.get_header(request)
+        raw_token = auth.get_raw_token(header) if header else None
+        if raw_token is None:
+            return None
+        # Signature and expiry checks are CPU-only; just the user lookup hits the DB
+        token = auth.get_validated_token(raw_token)
+        user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: token[jwt_settings.USER_ID_CLAIM]})
+        if not user.is_active:
+            raise InvalidToken("User is inactive")
+        return user
+
+    def get_queryset(self):
+        return self.viewset_class(request=self.request, format_kwarg=None).get_queryset()
+
+    def serialize(self, data, many: bool = False):
+        return self.serializer_class(data, many=many, context={"request": self.request}).data
+
+
+class AsyncListView(AsyncReadView):
+    """Page-number list with the same response shape as DRF's `PageNumberPagination`."""
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        # The order OrderingFilter applies on the sync endpoint when no `ordering` is passed
+        ordering = getattr(self.viewset_class, "ordering", None)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        paginator = Paginator(queryset, settings.REST_FRAMEWORK["PAGE_SIZE"])
+        try:
+            number = int(request.GET.get("page", 1))
+        except ValueError:
+            return JsonResponse({"detail": "Invalid page."}, status=404)
+        if number < 1:
+            return JsonResponse({"detail": "Invalid page."}, status=404)
+        offset = (number - 1) * paginator.per_page
+
+        # COUNT(*) and the page fetch are independent, so issue them together
+        count, rows = await run_concurrently(
+            queryset.count,
+            lambda: list(queryset[offset : offset + paginator.per_page]),
+        )
+        paginator.count = count
+        try:
+            page = paginator.page(number)
+        except InvalidPage:
+            return JsonResponse({"detail": "Invalid page."}, status=404)
+
+        def page_url(n):
+            params = request.GET.copy()
+            params["page"] = n
+            return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+        return JsonResponse(
+            {
+                "count": count,
+                "next": page_url(number + 1) if page.has_next() else None,
+                "previous": page_url(number - 1) if page.has_previous() else None,
+                "results": self.serialize(rows, many=True),
+            }
+        )
+
+
+class AsyncDetailView(AsyncReadView):
+    async def get(self, request, pk, *args, **kwargs):
+        obj = await self.get_queryset().filter(pk=pk).afirst()
+        if obj is None:
+            return JsonResponse({"detail": "Not found."}, status=404)
+        return JsonResponse(self.serialize(obj))
+
+
+class AsyncMeView(AsyncReadView):
+    async def get(self, request, *args, **kwargs):
+        return JsonResponse(UserSerializer(request.user).data)
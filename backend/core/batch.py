@@ -0,0 +1,101 @@
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions, serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from authentication.models import User
+from projects.access import membership_roles
+
+BATCH_PATH = "/api/batch/"
+
+
+class BatchItemSerializer(serializers.Serializer):
+    id = serializers.CharField(max_length=64, required=False)
+    method = serializers.ChoiceField(choices=["GET"], default="GET")
+    path = serializers.CharField(max_length=2048)
+
+    def validate_path(self, value):
+        route = urlsplit(value).path
+        if not route.startswith("/api/") or route.startswith(BATCH_PATH):
+            raise serializers.ValidationError("Only API paths other than the batch endpoint can be batched.")
+        try:
+            match = resolve(route)
+        except Resolver404:
+            raise serializers.ValidationError("No endpoint matches this path.")
+        # Sub-requests skip the middleware (the batch request itself went through it,
+        # including the concurrency limit), so only DRF views (which authenticate,
+        # check permissions and throttle by themselves) can be called this way
+        view_class = getattr(match.func, "cls", None)
+        if view_class is None or not issubclass(view_class, APIView):
+            raise serializers.ValidationError("This endpoint cannot be batched.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(child=BatchItemSerializer(), min_length=1)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(f"At most {settings.BATCH_MAX_REQUESTS} requests per batch.")
+        return value
+
+
+class BatchResultSerializer(serializers.Serializer):
+    id = serializers.CharField(allow_null=True)
+    status = serializers.IntegerField()
+    body = serializers.JSONField(allow_null=True)
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    responses = BatchResultSerializer(many=True)
+
+
+class BatchView(APIView):
+    """Run several GET requests against the API in one round trip.
+
+    The batch is authenticated once and every sub-request runs as the same user
+    object, so the cached project memberships are looked up at most once. Each
+    sub-request still goes through its view's permissions, throttles, filters and
+    pagination. Sub-requests run one after another in the batch's own thread, so
+    they share its database connection and its `ConcurrencyLimitMiddleware` slot:
+    a batch never has more than one query in flight. Results come back in request
+    order as `{"id", "status", "body"}`.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(request=BatchSerializer, responses=BatchResponseSerializer)
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["requests"]
+        if request.user.role != User.Roles.ADMIN:
+            membership_roles(request.user)
+        return Response({"responses": [self.run(request, item) for item in items]})
+
+    def run(self, request, item) -> Dict[str, Any]:
+        url = urlsplit(item["path"])
+        sub = HttpRequest()
+        sub.method = item["method"]
+        sub.path = sub.path_info = url.path
+        sub.META = {
+            **{key: value for key, value in request.META.items() if not key.startswith("CONTENT_")},
+            "REQUEST_METHOD": sub.method,
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+        }
+        sub.GET = QueryDict(url.query)
+        sub.COOKIES = request.COOKIES
+        # Picked up by DRF's Request instead of running the authenticators again
+        sub._force_auth_user = request.user
+        sub._force_auth_token = request.auth
+        match = resolve(url.path)
+        sub.resolver_match = match
+        response = match.func(sub, *match.args, **match.kwargs)
+        return {"id": item.get("id"), "status": response.status_code, "body": getattr(response, "data", None)}
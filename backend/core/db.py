@@ -0,0 +1,31 @@
+from typing import Optional
+
+from django.db import DatabaseError, connections, transaction
+
+
+def estimate_row_count(model, using: str = "default") -> Optional[int]:
+    """Planner's row estimate for `model`'s table, or `None` if the backend has none.
+
+    Reading catalog statistics is O(1), unlike `COUNT(*)` which scans the table (or
+    its smallest index) on PostgreSQL and MySQL/InnoDB.
+    """
+
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == "postgresql":
+        sql, params = "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)", [table]
+    elif connection.vendor == "mysql":
+        sql = "SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s"
+        params = [table]
+    else:
+        return None
+    try:
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    # reltuples is -1 for tables that were never analyzed
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
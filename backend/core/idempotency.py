@@ -0,0 +1,115 @@
+import functools
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .metrics import record_cache
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+# Headers of a stored response that are replayed along with its body
+REPLAYED_RESPONSE_HEADERS = ("Location",)
+
+
+def _fingerprint(request: Request) -> str:
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def cache_key(owner: str, method: str, path: str, key: str) -> str:
+    digest = hashlib.sha256(f"{owner}\n{method}\n{path}\n{key}".encode()).hexdigest()
+    return f"idempotency:{digest}"
+
+
+def _cache_key(request: Request, key: str) -> str:
+    # Keys are per client: per user when authenticated, otherwise only the matching
+    # body fingerprint (which includes e.g. the password on registration) lets a
+    # request see a stored response
+    owner = f"user:{request.user.pk}" if request.user and request.user.is_authenticated else "anon"
+    return cache_key(owner, request.method, request.path, key)
+
+
+def idempotent(handler=None, *, dump=None, load=None):
+    """Make a POST handler safe to retry with an `Idempotency-Key` header.
+
+    The first successful (2xx) response for a key is stored in the cache for
+    `IDEMPOTENCY_KEY_TTL_SECONDS` and replayed to retries without running the
+    handler again. A retry while the first request is still running gets 409, and
+    reusing a key with a different body gets 422. Requests without the header, and
+    other methods, are handled as usual. Works on viewset methods and function views.
+
+    `dump(response)` picks what is stored (default: the response data) and
+    `load(stored)` rebuilds the replayed data from it, e.g. to keep credentials out of
+    the cache and issue fresh ones on replay; returning `None` runs the handler again.
+    """
+
+    if handler is None:
+        return functools.partial(idempotent, dump=dump, load=load)
+
+    def replay(stored):
+        data = stored["data"] if load is None else load(stored["data"])
+        if data is None:
+            return None
+        return Response(data, status=stored["status"], headers={**stored["headers"], REPLAYED_HEADER: "true"})
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        request = args[1] if len(args) > 1 and isinstance(args[1], Request) else args[0]
+        key = request.headers.get(HEADER)
+        if request.method != "POST" or not key:
+            return handler(*args, **kwargs)
+        if len(key) > 255:
+            return Response({"detail": f"{HEADER} must be at most 255 characters."}, status=status.HTTP_400_BAD_REQUEST)
+
+        entry_key, fingerprint = _cache_key(request, key), _fingerprint(request)
+
+        def stored_response():
+            stored = cache.get(entry_key)
+            if stored is None:
+                return None
+            if stored["fingerprint"] != fingerprint:
+                return Response(
+                    {"detail": f"{HEADER} was already used with a different request."},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            return replay(stored)
+
+        response = stored_response()
+        record_cache("idempotency", response is not None)
+        if response is not None:
+            return response
+
+        lock_key = f"{entry_key}:lock"
+        if not cache.add(lock_key, True, settings.IDEMPOTENCY_LOCK_SECONDS):
+            return Response(
+                {"detail": f"A request with this {HEADER} is still in progress."},
+                status=status.HTTP_409_CONFLICT,
+                headers={"Retry-After": "1"},
+            )
+        try:
+            # The first request may have finished between the lookup and taking the lock
+            response = stored_response()
+            if response is not None:
+                return response
+            response = handler(*args, **kwargs)
+            if status.is_success(response.status_code):
+                cache.set(
+                    entry_key,
+                    {
+                        "fingerprint": fingerprint,
+                        "status": response.status_code,
+                        "data": response.data if dump is None else dump(response),
+                        "headers": {name: response[name] for name in REPLAYED_RESPONSE_HEADERS if name in response},
+                    },
+                    settings.IDEMPOTENCY_KEY_TTL_SECONDS,
+                )
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    return wrapper
@@ -0,0 +1,85 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.models import User
+
+DEFAULT_PAIRS = (
+    ("/api/tasks/tasks/", "/api/async/tasks/"),
+    ("/api/projects/projects/", "/api/async/projects/"),
+    ("/api/notifications/notifications/", "/api/async/notifications/"),
+    ("/api/auth/me/", "/api/async/auth/me/"),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput and latency of the synchronous (WSGI) read endpoints with "
+        "their async (ASGI) mirrors under /api/async/, in-process and at high concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="Username to authenticate as.")
+        parser.add_argument("--concurrency", type=int, default=64)
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        # The in-process test clients use the "testserver" host, and the benchmark should
+        # measure the views rather than the throttle
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+        settings.ROLE_THROTTLE_RATES = {"default": {}}
+        total, concurrency = options["requests"], options["concurrency"]
+
+        for sync_path, async_path in DEFAULT_PAIRS:
+            sync_stats = self.run_sync(sync_path, headers, total, concurrency)
+            async_stats = asyncio.run(self.run_async(async_path, headers, total, concurrency))
+            self.report("wsgi ", sync_path, sync_stats)
+            self.report("asgi ", async_path, async_stats)
+
+    def run_sync(self, path, headers, total, concurrency):
+        client = Client()
+
+        def one(_):
+            started = time.perf_counter()
+            status = client.get(path, headers=headers).status_code
+            return time.perf_counter() - started, status
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one, range(total)))
+        return time.perf_counter() - started, results
+
+    async def run_async(self, path, headers, total, concurrency):
+        client = AsyncClient()
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with gate:
+                started = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(total)))
+        return time.perf_counter() - started, results
+
+    def report(self, label, path, stats):
+        elapsed, results = stats
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, status in results if status >= 400)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{label} {path:<40} {len(results) / elapsed:8.1f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  errors {errors}"
+        )
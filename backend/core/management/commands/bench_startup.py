@@ -0,0 +1,95 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.models import User
+
+# Runs in a fresh interpreter: time the application import, then drive requests
+# straight through the WSGI callable so nothing is warmed up by a test client
+PROBE = r"""
+import io, json, os, sys, time
+from wsgiref.util import setup_testing_defaults
+
+started = time.perf_counter()
+from project_management.wsgi import application
+boot = time.perf_counter() - started
+
+from django.conf import settings
+settings.ROLE_THROTTLE_RATES = {"default": {}}
+
+def call(path):
+    environ = {"PATH_INFO": path, "REQUEST_METHOD": "GET", "wsgi.input": io.BytesIO()}
+    setup_testing_defaults(environ)
+    if os.environ.get("BENCH_TOKEN"):
+        environ["HTTP_AUTHORIZATION"] = "Bearer " + os.environ["BENCH_TOKEN"]
+    started = time.perf_counter()
+    body = application(environ, lambda status, headers, exc_info=None: None)
+    b"".join(body)
+    getattr(body, "close", lambda: None)()
+    return time.perf_counter() - started
+
+paths = json.loads(os.environ["BENCH_PATHS"])
+latencies = [call(paths[i % len(paths)]) for i in range(int(os.environ["BENCH_REQUESTS"]))]
+print(json.dumps({"boot": boot, "latencies": latencies}))
+"""
+
+DEFAULT_PATHS = ["/api/tasks/tasks/", "/api/projects/projects/", "/api/notifications/notifications/", "/api/auth/me/"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker cold start: application import time and first-request latency "
+        "versus steady state, with and without WARM_UP_ON_BOOT, in fresh processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username to authenticate as (anonymous requests otherwise).")
+        parser.add_argument("--runs", type=int, default=5, help="Fresh processes per mode.")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per process.")
+        parser.add_argument("--path", action="append", dest="paths", help="Path to request (repeatable).")
+
+    def handle(self, *args, **options):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "project_management.settings"),
+            "ALLOWED_HOSTS": ",".join([*settings.ALLOWED_HOSTS, "127.0.0.1"]),
+            "BENCH_PATHS": json.dumps(options["paths"] or DEFAULT_PATHS),
+            "BENCH_REQUESTS": str(max(2, options["requests"])),
+            # Measure start-up, not the concurrency limiter (the probe also lifts throttling)
+            "MAX_CONCURRENT_REQUESTS": "0",
+        }
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']!r} does not exist.")
+            env["BENCH_TOKEN"] = str(AccessToken.for_user(user))
+
+        for warm in (False, True):
+            boots, firsts, steady = [], [], []
+            for _ in range(options["runs"]):
+                result = self.probe({**env, "WARM_UP_ON_BOOT": str(warm)})
+                boots.append(result["boot"])
+                firsts.append(result["latencies"][0])
+                steady.extend(result["latencies"][1:])
+            steady.sort()
+            p99 = steady[min(len(steady) - 1, int(len(steady) * 0.99))]
+            self.stdout.write(
+                f"warm_up={'on ' if warm else 'off'}  boot {statistics.median(boots) * 1000:7.1f} ms  "
+                f"first request {statistics.median(firsts) * 1000:7.1f} ms (max {max(firsts) * 1000:7.1f})  "
+                f"steady p50 {statistics.median(steady) * 1000:6.1f} ms  p99 {p99 * 1000:6.1f} ms"
+            )
+
+    def probe(self, env):
+        completed = subprocess.run(
+            [sys.executable, "-c", PROBE], env=env, cwd=settings.BASE_DIR, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            raise CommandError(completed.stderr.strip().splitlines()[-1] if completed.stderr else "probe failed")
+        return json.loads(completed.stdout.strip().splitlines()[-1])
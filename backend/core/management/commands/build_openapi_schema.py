@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.schema import write_artifacts
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema once (e.g. at deploy time) and store it with its "
+        "ETag under OPENAPI_SCHEMA_DIR, where /api/schema/ serves it from."
+    )
+
+    def handle(self, *args, **options):
+        for fmt, path in write_artifacts().items():
+            self.stdout.write(f"{fmt:<5} {path} ({path.stat().st_size} bytes)")
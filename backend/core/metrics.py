@@ -0,0 +1,314 @@
+"""In-process request, database, cache and authentication metrics.
+
+Every thread records into its own shard of the registry, so the hot path takes no
+lock; shards are only merged when the metrics are flushed or scraped, and the shard
+of a finished thread is folded into a process-level total. With several
+worker processes set `METRICS_DIR`: each process periodically writes its totals to
+`metrics-<pid>.json` there and `/metrics` adds all files up. Everything is a
+cumulative counter or fixed-bucket histogram, so totals from recycled workers stay
+valid (gunicorn folds them into `metrics-archive.json`, see `gunicorn.conf.py`).
+"""
+
+import hmac
+import json
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+ARCHIVE_FILE = "metrics-archive.json"
+
+Key = Tuple[str, Tuple[str, ...]]
+
+
+class _ShardOwner:
+    """Held only by a thread's locals, so it is collected when the thread ends."""
+
+    def __init__(self):
+        self.values: dict = {}
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, "Metric"] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all values, e.g. those a forked worker inherited from its parent."""
+
+        self._local = threading.local()
+        self._shards: Dict[int, dict] = {}
+        self._retired: Dict[Key, object] = {}
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def register(self, metric: "Metric") -> "Metric":
+        self.metrics[metric.name] = metric
+        return metric
+
+    def shard(self) -> dict:
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            owner = self._local.owner = _ShardOwner()
+            with self._lock:
+                self._shards[id(owner.values)] = owner.values
+            # Short-lived threads (e.g. thread pools) would otherwise leave a shard behind each
+            weakref.finalize(owner, self._retire, self._shards, owner.values)
+        return owner.values
+
+    def _retire(self, shards: Dict[int, dict], values: dict) -> None:
+        with self._lock:
+            # Shards from before a reset() are dropped, not folded in
+            if shards is self._shards and shards.pop(id(values), None) is not None:
+                merge(self._retired, values.items())
+
+    def snapshot(self) -> Dict[Key, object]:
+        with self._lock:
+            shards = list(self._shards.values())
+            totals: Dict[Key, object] = {}
+            merge(totals, self._retired.items())
+        for shard in shards:
+            merge(totals, dict(shard).items())
+        return totals
+
+    def path(self, pid: Optional[int] = None) -> str:
+        return os.path.join(settings.METRICS_DIR, f"metrics-{pid or os.getpid()}.json")
+
+    def flush(self) -> None:
+        if not settings.METRICS_DIR:
+            return
+        self._flushed_at = time.monotonic()
+        write(self.path(), self.snapshot().items())
+
+    def maybe_flush(self) -> None:
+        if settings.METRICS_DIR and time.monotonic() - self._flushed_at >= settings.METRICS_FLUSH_SECONDS:
+            self.flush()
+
+    def collect(self) -> Dict[Key, object]:
+        """This process's live values plus everything other processes have flushed."""
+
+        totals = self.snapshot()
+        if settings.METRICS_DIR and os.path.isdir(settings.METRICS_DIR):
+            own = os.path.basename(self.path())
+            for name in os.listdir(settings.METRICS_DIR):
+                if name.startswith("metrics-") and name.endswith(".json") and name != own:
+                    merge(totals, read(os.path.join(settings.METRICS_DIR, name)))
+        return totals
+
+    def archive(self, pid: int) -> None:
+        """Fold an exited worker's file into the archive so the directory stays small."""
+
+        if not settings.METRICS_DIR:
+            return
+        path = self.path(pid)
+        if not os.path.exists(path):
+            return
+        archive = os.path.join(settings.METRICS_DIR, ARCHIVE_FILE)
+        totals: Dict[Key, object] = {}
+        merge(totals, read(archive))
+        merge(totals, read(path))
+        write(archive, totals.items())
+        os.remove(path)
+
+
+def merge(totals: Dict[Key, object], items: Iterable[Tuple[Key, object]]) -> None:
+    for key, value in items:
+        current = totals.get(key)
+        if current is None:
+            totals[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(value, list):
+            totals[key] = [a + b for a, b in zip(current, value)]
+        else:
+            totals[key] = current + value
+
+
+def read(path: str) -> List[Tuple[Key, object]]:
+    try:
+        with open(path) as fh:
+            rows = json.load(fh)
+    except (OSError, ValueError):
+        return []
+    return [((name, tuple(labels)), value) for name, labels, value in rows]
+
+
+def write(path: str, items: Iterable[Tuple[Key, object]]) -> None:
+    # Write beside the target and rename, so readers never see a partial file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump([[name, list(labels), value] for (name, labels), value in items], fh)
+    os.replace(tmp, path)
+
+
+registry = Registry()
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        registry.register(self)
+
+    def key(self, labels: Dict[str, str]) -> Key:
+        return self.name, tuple(str(labels[label]) for label in self.labels)
+
+    def format_labels(self, values: Tuple[str, ...], **extra: str) -> str:
+        pairs = [*zip(self.labels, values), *extra.items()]
+        if not pairs:
+            return ""
+        escaped = (
+            (label, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for label, value in pairs
+        )
+        return "{" + ",".join(f'{label}="{value}"' for label, value in escaped) + "}"
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        shard = registry.shard()
+        key = self.key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def samples(self, values: Tuple[str, ...], total) -> List[str]:
+        return [f"{self.name}{self.format_labels(values)} {total}"]
+
+
+class Histogram(Metric):
+    """Fixed buckets; stored per key as `[count per bucket..., count above all, sum]`."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels: str) -> None:
+        shard = registry.shard()
+        key = self.key(labels)
+        row = shard.get(key)
+        if row is None:
+            row = shard[key] = [0] * (len(self.buckets) + 2)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def samples(self, values: Tuple[str, ...], row: List[float]) -> List[str]:
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.buckets, "+Inf"), row):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{self.format_labels(values, le=str(bound))} {cumulative}")
+        lines.append(f"{self.name}_sum{self.format_labels(values)} {row[-1]}")
+        lines.append(f"{self.name}_count{self.format_labels(values)} {cumulative}")
+        return lines
+
+
+http_requests = Counter("http_requests_total", "Requests handled.", ("view", "action", "method", "status"))
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Time from the outermost middleware in to the response out.", ("view", "action")
+)
+http_request_db_duration = Histogram(
+    "http_request_db_duration_seconds", "Time spent in database queries per request.", ("view", "action")
+)
+db_queries = Counter("db_queries_total", "Database queries executed.", ("alias",))
+db_query_duration = Histogram("db_query_duration_seconds", "Duration of single queries.", ("alias",), QUERY_BUCKETS)
+db_connections_opened = Counter(
+    "db_connections_opened_total", "New database connections; steady growth means no connection reuse.", ("alias",)
+)
+cache_requests = Counter("cache_requests_total", "Application cache lookups.", ("cache", "result"))
+auth_duration = Histogram(
+    "auth_duration_seconds", "Time to authenticate a request.", ("backend", "result"), QUERY_BUCKETS
+)
+
+# Database seconds spent by the current request; a mutable cell so time recorded in
+# sync_to_async threads (which run in a copy of the context) still adds up
+_request_db_time: ContextVar[Optional[List[float]]] = ContextVar("request_db_time", default=None)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    cache_requests.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def time_query(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        alias = context["connection"].alias
+        db_queries.inc(alias=alias)
+        db_query_duration.observe(elapsed, alias=alias)
+        cell = _request_db_time.get()
+        if cell is not None:
+            cell[0] += elapsed
+
+
+def instrument_connection(sender, connection, **kwargs) -> None:
+    db_connections_opened.inc(alias=connection.alias)
+    # The wrapper object outlives reconnects; install the timer only once
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+connection_created.connect(instrument_connection, dispatch_uid="core.metrics.instrument_connection")
+
+
+def start_request():
+    return _request_db_time.set([0.0])
+
+
+def finish_request(request, response, elapsed: float, token) -> None:
+    db_time = _request_db_time.get()[0]
+    _request_db_time.reset(token)
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        view, action = "unmatched", ""
+    else:
+        view = match.view_name or match._func_path
+        # Viewset routes map HTTP methods to actions (list, retrieve, board, ...)
+        action = (getattr(match.func, "actions", None) or {}).get(request.method.lower(), "")
+    http_requests.inc(view=view, action=action, method=request.method, status=response.status_code)
+    http_request_duration.observe(elapsed, view=view, action=action)
+    http_request_db_duration.observe(db_time, view=view, action=action)
+    registry.maybe_flush()
+
+
+def render(values: Dict[Key, object]) -> str:
+    """Prometheus text exposition format 0.0.4."""
+
+    lines = []
+    for name, metric in registry.metrics.items():
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for (sample_name, labels), value in sorted(values.items()):
+            if sample_name == name:
+                lines.extend(metric.samples(labels, value))
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    """Scrape endpoint; answers 404 to clients outside `METRICS_ALLOWED_IPS`.
+
+    The check uses `REMOTE_ADDR`, which behind a reverse proxy is the proxy's
+    address; there, either keep /metrics off the proxy or set `METRICS_TOKEN` so
+    scrapers must also send `Authorization: Bearer <token>`.
+    """
+
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    if settings.METRICS_TOKEN and not hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {settings.METRICS_TOKEN}".encode()
+    ):
+        raise Http404
+    return HttpResponse(render(registry.collect()), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+
+from . import metrics
+
+
+class ConcurrencyLimitMiddleware:
+    """Cap in-flight requests per worker process and shed the excess with 503.
+
+    Requests wait up to `CONCURRENCY_QUEUE_TIMEOUT` seconds for a slot; beyond that the
+    worker answers immediately instead of piling more work onto a saturated database.
+    `MAX_CONCURRENT_REQUESTS = 0` disables the limiter. Works in both WSGI and ASGI
+    stacks so async views are not forced back onto a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        limit = settings.MAX_CONCURRENT_REQUESTS
+        self.slots = None
+        if limit:
+            self.slots = asyncio.Semaphore(limit) if self.is_async else threading.BoundedSemaphore(limit)
+        self.queue_timeout = settings.CONCURRENCY_QUEUE_TIMEOUT
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if self.slots is None:
+            return self.get_response(request)
+        if not self.slots.acquire(timeout=self.queue_timeout):
+            return self.busy_response()
+        try:
+            return self.get_response(request)
+        finally:
+            self.slots.release()
+
+    async def __acall__(self, request):
+        if self.slots is None:
+            return await self.get_response(request)
+        try:
+            await asyncio.wait_for(self.slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            return self.busy_response()
+        try:
+            return await self.get_response(request)
+        finally:
+            self.slots.release()
+
+    @staticmethod
+    def busy_response():
+        response = JsonResponse({"detail": "Server is busy, please retry shortly."}, status=503)
+        response["Retry-After"] = "1"
+        return response
+
+
+class MetricsMiddleware:
+    """Record count, latency and database time of every request (see `core.metrics`).
+
+    Goes first in `MIDDLEWARE` so the timings include the other middleware and
+    requests shed by `ConcurrencyLimitMiddleware` are counted too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token, started = metrics.start_request(), time.perf_counter()
+        response = self.get_response(request)
+        metrics.finish_request(request, response, time.perf_counter() - started, token)
+        return response
+
+    async def __acall__(self, request):
+        token, started = metrics.start_request(), time.perf_counter()
+        response = await self.get_response(request)
+        metrics.finish_request(request, response, time.perf_counter() - started, token)
+        return response
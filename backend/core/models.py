@@ -0,0 +1,39 @@
+from django.db import models
+from django.utils import timezone
+
+# Index conditions for soft-deletable models
+LIVE = models.Q(deleted_at__isnull=True)
+DELETED = models.Q(deleted_at__isnull=False)
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def soft_delete(self, **extra) -> int:
+        """Mark the rows deleted with one UPDATE; `manage.py purge_deleted` removes them later."""
+
+        return self.update(deleted_at=timezone.now(), **extra)
+
+
+class LiveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Default manager that hides soft-deleted rows."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class SoftDeleteModel(models.Model):
+    """Abstract base for models deleted by stamping `deleted_at`.
+
+    `objects` (the default manager, also used by serializers, admin and reverse
+    relations) only returns live rows; `all_objects` includes deleted ones. Forward
+    foreign key access still resolves deleted targets through the base manager.
+    Subclasses should index their hot lookups with `condition=LIVE` so the partial
+    indexes only cover live rows.
+    """
+
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager()
+    all_objects = models.Manager.from_queryset(SoftDeleteQuerySet)()
+
+    class Meta:
+        abstract = True
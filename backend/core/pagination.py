@@ -0,0 +1,136 @@
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from .paginator import ApproximateCountPaginator
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """Page-number pagination that avoids exact `COUNT(*)` over huge result sets.
+
+    Responses keep the usual `count`/`next`/`previous`/`results` keys and add
+    `count_is_approximate`, which is true when `count` is an estimate.
+    """
+
+    django_paginator_class = ApproximateCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_is_approximate": self.page.paginator.count_is_approximate,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_approximate"] = {"type": "boolean", "example": False}
+        return response_schema
+
+
+def seek_after(ordering: Sequence[str], values: List[Any]) -> models.Q:
+    """Rows strictly after `values` in `ordering` (names may carry a `-` prefix).
+
+    The row-value comparison `(f1, f2, ...) > (v1, v2, ...)` is expanded into ORs so
+    it can use a composite index on the same fields.
+    """
+
+    condition = models.Q()
+    for i, field in enumerate(ordering):
+        name = field.lstrip("-")
+        step = models.Q(**{f"{name}__{'lt' if field.startswith('-') else 'gt'}": values[i]})
+        for prev_field, prev_value in zip(ordering[:i], values[:i]):
+            step &= models.Q(**{prev_field.lstrip("-"): prev_value})
+        condition |= step
+    return condition
+
+
+def encode_cursor(obj: models.Model, ordering: Sequence[str]) -> str:
+    values = [obj._meta.get_field(field.lstrip("-")).value_to_string(obj) for field in ordering]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(model, ordering: Sequence[str], cursor: str) -> List[Any]:
+    """Inverse of `encode_cursor`; raises a DRF `ValidationError` for malformed input."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError
+        return [model._meta.get_field(field.lstrip("-")).to_python(value) for field, value in zip(ordering, values)]
+    except (ValueError, TypeError, DjangoValidationError):
+        raise ValidationError("Invalid cursor.")
+
+
+class KeysetPagination:
+    """Keyset ("seek") pagination over a unique ordering such as `(created_at, id)`.
+
+    Pages are fetched with `WHERE (a, b) < (x, y) ORDER BY a DESC, b DESC LIMIT n` so
+    the cost is independent of how deep the client scrolls, as long as an index
+    matches `ordering`. Without a cursor the newest page is returned; `before` loads
+    older rows and `after` loads newer ones. Results are always oldest-first.
+    """
+
+    ordering: Sequence[str] = ("created_at", "id")
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = "limit"
+    before_query_param = "before"
+    after_query_param = "after"
+
+    def paginate_queryset(self, queryset: models.QuerySet, request, view=None) -> List[Any]:
+        self.model = queryset.model
+        limit = self.get_page_size(request)
+        before = self.decode_cursor(request.query_params.get(self.before_query_param))
+        after = self.decode_cursor(request.query_params.get(self.after_query_param))
+        if before is not None and after is not None:
+            raise ValidationError(f"Use either '{self.before_query_param}' or '{self.after_query_param}', not both.")
+
+        if after is not None:
+            rows = list(queryset.filter(self.seek(after, "gt")).order_by(*self.ordering)[: limit + 1])
+            self.has_after, self.has_before = len(rows) > limit, True
+            self.page = rows[:limit]
+        else:
+            qs = queryset.filter(self.seek(before, "lt")) if before is not None else queryset
+            rows = list(qs.order_by(*[f"-{name}" for name in self.ordering])[: limit + 1])
+            self.has_before, self.has_after = len(rows) > limit, before is not None
+            self.page = rows[:limit][::-1]
+        return self.page
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            {
+                self.before_query_param: self.encode_cursor(self.page[0]) if self.has_before and self.page else None,
+                self.after_query_param: self.encode_cursor(self.page[-1]) if self.has_after and self.page else None,
+                "results": data,
+            }
+        )
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def seek(self, values: List[Any], lookup: str) -> models.Q:
+        """Rows after (`"gt"`) or before (`"lt"`) `values` in `ordering`."""
+
+        ordering = self.ordering if lookup == "gt" else [f"-{name}" for name in self.ordering]
+        return seek_after(ordering, values)
+
+    def encode_cursor(self, obj) -> str:
+        return encode_cursor(obj, self.ordering)
+
+    def decode_cursor(self, cursor: Optional[str]) -> Optional[List[Any]]:
+        return decode_cursor(self.model, self.ordering, cursor) if cursor else None
@@ -0,0 +1,117 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .db import estimate_row_count
+
+
+# Full counts of large filtered lists run here, off the request thread
+_count_refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="count-refresh")
+
+
+def refresh_count(key: str, queryset) -> None:
+    """Count `queryset` exactly and cache the result under `key`."""
+
+    try:
+        cache.set(key, queryset.count(), settings.ESTIMATED_COUNT_CACHE_SECONDS)
+    finally:
+        cache.delete(f"{key}:refreshing")
+
+
+def _refresh_count_in_thread(key: str, queryset) -> None:
+    try:
+        refresh_count(key, queryset)
+    finally:
+        connections[queryset.db].close()
+
+
+def schedule_count_refresh(key: str, queryset) -> None:
+    # At most one refresh per key is queued or running at a time
+    if cache.add(f"{key}:refreshing", True, settings.ESTIMATED_COUNT_CACHE_SECONDS):
+        _count_refresher.submit(_refresh_count_in_thread, key, queryset.all())
+
+
+def is_unfiltered(queryset) -> bool:
+    """True if `queryset` filters nothing beyond its model's default manager.
+
+    Soft-deletable models always carry the live-rows condition, which would otherwise
+    look like a filter. The table estimate then includes deleted rows still awaiting
+    purge, which is fine for an approximate count.
+    """
+
+    where = queryset.query.where
+    return not where or where == queryset.model._default_manager.all().query.where
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator for admin changelists over large tables.
+
+    Unfiltered changelists use the planner's row estimate instead of `COUNT(*)` once
+    the table exceeds `ESTIMATED_COUNT_THRESHOLD` rows; filtered ones (and backends
+    without statistics) still count exactly.
+    """
+
+    @cached_property
+    def count(self):
+        if hasattr(self.object_list, "query") and is_unfiltered(self.object_list):
+            estimate = estimate_row_count(self.object_list.model, using=self.object_list.db)
+            if estimate is not None and estimate >= settings.ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator whose `count` is exact only up to `ESTIMATED_COUNT_THRESHOLD`.
+
+    The bounded count (`COUNT(*)` over `LIMIT threshold + 1`) stops scanning early.
+    Past the threshold, unfiltered querysets use planner statistics and everything
+    else a full count cached for `ESTIMATED_COUNT_CACHE_SECONDS`. That count is taken
+    in a background thread; until it is cached the bounded count is returned. Either
+    way `count_is_approximate` is set and page numbers beyond the count stay reachable.
+    """
+
+    count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        threshold = settings.ESTIMATED_COUNT_THRESHOLD
+        # Selecting only the pk keeps per-row annotations (e.g. subquery counts) out of the count
+        bounded = queryset.order_by().values("pk")[: threshold + 1].count()
+        if bounded <= threshold:
+            return bounded
+
+        self.count_is_approximate = True
+        if is_unfiltered(queryset):
+            estimate = estimate_row_count(queryset.model, using=queryset.db)
+            if estimate is not None:
+                return max(estimate, bounded)
+        key = f"approx-count:{queryset.db}:" + hashlib.sha1(str(queryset.query).encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            schedule_count_refresh(key, queryset)
+            return bounded
+        return max(count, bounded)
+
+    def validate_number(self, number):
+        if self.count and self.count_is_approximate:
+            try:
+                number = int(number)
+            except (TypeError, ValueError):
+                raise PageNotAnInteger("That page number is not an integer")
+            if number < 1:
+                raise EmptyPage("That page number is less than 1")
+            return number
+        return super().validate_number(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_approximate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom : bottom + self.per_page], number, self)
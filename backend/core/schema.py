@@ -0,0 +1,87 @@
+import hashlib
+from pathlib import Path
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+RENDERERS = {"yaml": OpenApiYamlRenderer, "json": OpenApiJsonRenderer}
+
+# Schema bytes and ETag per format, loaded or generated once per process
+_artifacts: Dict[str, Tuple[bytes, str]] = {}
+
+
+def artifact_path(fmt: str) -> Path:
+    return Path(settings.OPENAPI_SCHEMA_DIR) / f"schema.{fmt}"
+
+
+def generate_schema() -> dict:
+    """Build the public schema by introspecting every view (slow; seconds of CPU)."""
+
+    return SchemaGenerator().get_schema(request=None, public=True)
+
+
+def render_schema(fmt: str, schema=None) -> bytes:
+    return RENDERERS[fmt]().render(schema or generate_schema(), renderer_context={})
+
+
+def make_etag(content: bytes) -> str:
+    return '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+
+
+def write_artifacts() -> Dict[str, Path]:
+    """Render every format to `OPENAPI_SCHEMA_DIR`, each with a `.etag` sidecar."""
+
+    schema = generate_schema()
+    written = {}
+    for fmt in RENDERERS:
+        path = artifact_path(fmt)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = render_schema(fmt, schema)
+        path.write_bytes(content)
+        path.with_name(path.name + ".etag").write_text(make_etag(content))
+        written[fmt] = path
+    return written
+
+
+def load_artifact(fmt: str) -> Tuple[bytes, str]:
+    """Schema bytes and ETag, from the built artifact or, failing that, generated once."""
+
+    if fmt not in _artifacts:
+        path = artifact_path(fmt)
+        if path.exists():
+            content = path.read_bytes()
+            etag_path = path.with_name(path.name + ".etag")
+            etag = etag_path.read_text().strip() if etag_path.exists() else make_etag(content)
+        else:
+            content = render_schema(fmt)
+            etag = make_etag(content)
+        _artifacts[fmt] = (content, etag)
+    return _artifacts[fmt]
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """Serve the OpenAPI schema built by `manage.py build_openapi_schema`.
+
+    Responses carry an ETag and honour `If-None-Match`. Live generation on every
+    request only happens with `DEBUG` on, so schema edits show up during development.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if settings.DEBUG:
+            return super().get(request, *args, **kwargs)
+        renderer = request.accepted_renderer
+        fmt = "json" if renderer.format == "json" else "yaml"
+        content, etag = load_artifact(fmt)
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type=request.accepted_media_type)
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
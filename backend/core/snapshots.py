@@ -0,0 +1,73 @@
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from projects.access import can_view
+from .metrics import record_cache
+
+
+class SnapshotCache:
+    """Write-through cache of serialized detail payloads, keyed by object id.
+
+    Each entry stores the payload, its `version` (the object's `updated_at`) and the
+    access metadata needed to authorize a read without loading the row. Writers
+    refresh entries on save and drop them on delete; a write carrying an older
+    version than the cached one is ignored so out-of-order saves cannot regress it.
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+
+    def key(self, pk) -> str:
+        return f"snapshot:{self.label}:{pk}"
+
+    def get(self, pk) -> Optional[Dict[str, Any]]:
+        snapshot = cache.get(self.key(pk))
+        record_cache(f"snapshot:{self.label}", snapshot is not None)
+        return snapshot
+
+    def set(self, pk, version: str, data: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        current = cache.get(self.key(pk))
+        if current is not None and current["version"] > version:
+            return
+        cache.set(
+            self.key(pk),
+            {"version": version, "data": data, "meta": meta},
+            settings.SNAPSHOT_CACHE_SECONDS,
+        )
+
+    def delete(self, pk) -> None:
+        cache.delete(self.key(pk))
+
+    def delete_many(self, pks: Iterable) -> None:
+        cache.delete_many([self.key(pk) for pk in pks])
+
+
+task_snapshots = SnapshotCache("task")
+project_snapshots = SnapshotCache("project")
+
+
+class SnapshotRetrieveMixin:
+    """Serve `retrieve` from a `SnapshotCache`, falling back to the database on a miss.
+
+    A cached payload is only returned if `can_view` allows it for the cached
+    `project_id`/`created_by_id`, using the requester's cached memberships, so a hit
+    never touches the model's table. Misses are serialized normally and stored.
+    """
+
+    snapshot_cache: SnapshotCache = None
+
+    def store_snapshot(self, instance, data) -> None:
+        raise NotImplementedError
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        snapshot = self.snapshot_cache.get(kwargs[lookup])
+        if snapshot is not None and can_view(request.user, **snapshot["meta"]):
+            return Response(snapshot["data"])
+        instance = self.get_object()
+        data = self.get_serializer(instance).data
+        self.store_snapshot(instance, data)
+        return Response(data)
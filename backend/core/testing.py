@@ -0,0 +1,25 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from authentication.models import User
+
+
+class AdminQueryBudgetMixin:
+    """Helpers for asserting that admin changelists run a bounded number of queries."""
+
+    @classmethod
+    def create_admin_user(cls) -> User:
+        return User.objects.create_superuser(
+            username="root", email="root@example.com", password="pass1234", role=User.Roles.ADMIN
+        )
+
+    def assertChangelistWithinBudget(self, url: str, budget: int) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(
+            len(queries),
+            budget,
+            f"{url} ran {len(queries)} queries (budget {budget}):\n"
+            + "\n".join(query["sql"] for query in queries.captured_queries),
+        )
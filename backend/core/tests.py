@@ -0,0 +1,233 @@
+import gc
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import Http404
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.models import User
+from projects.models import Project, ProjectMembership
+from tasks.models import Task
+from .metrics import metrics_view, record_cache, registry
+from .paginator import ApproximateCountPaginator, EstimatedCountPaginator, is_unfiltered, refresh_count
+from .throttling import RoleRateThrottle, parse_rate
+
+
+@override_settings(ESTIMATED_COUNT_THRESHOLD=2)
+class EstimatedCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username="owner", password="pass1234")
+        project = Project.objects.create(name="Project", created_by=user)
+        Task.objects.bulk_create([Task(project=project, name=f"Task {i}", created_by=user) for i in range(5)])
+
+    def test_live_rows_filter_does_not_count_as_filtered(self):
+        self.assertTrue(is_unfiltered(Task.objects.select_related("project")))
+        self.assertTrue(is_unfiltered(Task.all_objects.all()))
+        self.assertFalse(is_unfiltered(Task.objects.filter(status=Task.Status.PENDING)))
+
+    @mock.patch("core.paginator.estimate_row_count", return_value=50000)
+    def test_soft_deletable_tables_use_the_planner_estimate(self, estimate):
+        self.assertEqual(EstimatedCountPaginator(Task.objects.all(), 20).count, 50000)
+        paginator = ApproximateCountPaginator(Task.objects.all(), 20)
+        self.assertEqual(paginator.count, 50000)
+        self.assertTrue(paginator.count_is_approximate)
+
+    @mock.patch("core.paginator.estimate_row_count", return_value=50000)
+    def test_filtered_querysets_count_exactly(self, estimate):
+        self.assertEqual(EstimatedCountPaginator(Task.objects.filter(status=Task.Status.PENDING), 20).count, 5)
+        estimate.assert_not_called()
+
+    def test_large_filtered_counts_are_refreshed_out_of_band(self):
+        cache.clear()
+        queryset = Task.objects.filter(status=Task.Status.PENDING)
+        with mock.patch("core.paginator._count_refresher") as refresher:
+            paginator = ApproximateCountPaginator(queryset, 20)
+            self.assertEqual(paginator.count, 3)
+            self.assertTrue(paginator.count_is_approximate)
+            # A second miss does not queue another refresh while one is pending
+            self.assertEqual(ApproximateCountPaginator(queryset, 20).count, 3)
+        refresher.submit.assert_called_once()
+        refresh_count(*refresher.submit.call_args.args[1:])
+        self.assertEqual(ApproximateCountPaginator(queryset, 20).count, 5)
+
+
+@override_settings(ROLE_THROTTLE_RATES={"default": {"anon": "5/d"}})
+class RoleRateThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def allow(self, ip="10.0.0.1"):
+        request = SimpleNamespace(user=AnonymousUser(), META={"REMOTE_ADDR": ip})
+        return RoleRateThrottle().allow_request(request, view=None)
+
+    def test_limit_holds_under_concurrent_requests(self):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda _: self.allow(), range(40)))
+        self.assertEqual(results.count(True), 5)
+
+    def test_clients_are_limited_separately(self):
+        for _ in range(5):
+            self.assertTrue(self.allow())
+        self.assertFalse(self.allow())
+        self.assertTrue(self.allow(ip="10.0.0.2"))
+
+    def test_previous_window_still_counts(self):
+        with mock.patch("core.throttling.time.time", return_value=86400 * 100 + 10):
+            for _ in range(5):
+                self.assertTrue(self.allow())
+        # Just after the rollover almost all of the previous day is still in the window
+        with mock.patch("core.throttling.time.time", return_value=86400 * 101 + 10):
+            throttle = RoleRateThrottle()
+            request = SimpleNamespace(user=AnonymousUser(), META={"REMOTE_ADDR": "10.0.0.1"})
+            self.assertFalse(throttle.allow_request(request, view=None))
+            self.assertGreater(throttle.wait(), 0)
+
+    def test_rates_parse_to_limit_and_period(self):
+        self.assertEqual(parse_rate("120/min"), (120, 60))
+        self.assertEqual(parse_rate("5/d"), (5, 86400))
+        self.assertIsNone(parse_rate(None))
+
+
+class MetricsTests(SimpleTestCase):
+    def test_finished_threads_are_folded_into_the_totals(self):
+        key = ("cache_requests_total", ("metrics-test", "hit"))
+        before = registry.snapshot().get(key, 0)
+        threads = [threading.Thread(target=record_cache, args=("metrics-test", True)) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        gc.collect()
+        self.assertEqual(registry.snapshot()[key], before + 20)
+        self.assertLess(len(registry._shards), 20)
+
+    @override_settings(METRICS_ALLOWED_IPS=["127.0.0.1"], METRICS_TOKEN="secret")
+    def test_scrapes_need_an_allowed_address_and_the_token(self):
+        factory = RequestFactory()
+        response = metrics_view(factory.get("/metrics", HTTP_AUTHORIZATION="Bearer secret"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("# TYPE http_requests_total counter", response.content.decode())
+        for request in (
+            factory.get("/metrics"),
+            factory.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong"),
+            factory.get("/metrics", HTTP_AUTHORIZATION="Bearer secret", REMOTE_ADDR="10.0.0.1"),
+        ):
+            with self.assertRaises(Http404):
+                metrics_view(request)
+
+
+class BatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="member", password="pass1234", role=User.Roles.COLLABORATOR)
+        owner = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.project = Project.objects.create(name="Project", created_by=owner)
+        ProjectMembership.objects.create(project=cls.project, user=cls.user)
+        cls.task = Task.objects.create(project=cls.project, name="Visible", created_by=owner)
+        hidden = Project.objects.create(name="Hidden", created_by=owner)
+        cls.hidden_task = Task.objects.create(project=hidden, name="Hidden", created_by=owner)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def batch(self, *paths):
+        requests = [{"id": str(i), "path": path} for i, path in enumerate(paths)]
+        return self.client.post(reverse("batch"), {"requests": requests}, format="json")
+
+    def test_responses_come_back_in_request_order(self):
+        response = self.batch(
+            reverse("task-detail", args=[self.task.pk]),
+            reverse("project-list"),
+            reverse("task-list") + f"?project={self.project.pk}",
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.data["responses"]
+        self.assertEqual([result["id"] for result in results], ["0", "1", "2"])
+        self.assertEqual([result["status"] for result in results], [200, 200, 200])
+        self.assertEqual(results[0]["body"]["name"], "Visible")
+        self.assertEqual([task["id"] for task in results[2]["body"]["results"]], [self.task.pk])
+
+    def test_each_sub_request_checks_its_own_permissions(self):
+        response = self.batch(
+            reverse("task-detail", args=[self.hidden_task.pk]), reverse("task-detail", args=[self.task.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result["status"] for result in response.data["responses"]], [404, 200])
+
+    def test_paths_that_cannot_be_batched_are_rejected(self):
+        for path in (reverse("batch"), "/admin/", "/api/unknown/", reverse("metrics")):
+            with self.subTest(path=path):
+                self.assertEqual(self.batch(path).status_code, 400)
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_batch_size_is_limited(self):
+        path = reverse("project-list")
+        self.assertEqual(self.batch(path, path).status_code, 200)
+        response = self.batch(path, path, path)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("requests", response.data)
+
+    def test_batch_requires_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.batch(reverse("project-list")).status_code, 401)
+
+
+# Async lists query from extra threads with their own connections, which only see committed rows
+class AsyncReadViewTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner, self.outsider = (
+            User.objects.create_user(username=name, password="pass1234", role=User.Roles.COLLABORATOR)
+            for name in ("owner", "outsider")
+        )
+        self.project = Project.objects.create(name="Project", created_by=self.owner)
+        ProjectMembership.objects.create(project=self.project, user=self.owner)
+        # Created first, so the sync list's board order differs from creation order
+        Task.objects.create(project=self.project, name="Started", status=Task.Status.IN_PROGRESS, created_by=self.owner)
+        self.tasks = [Task.objects.create(project=self.project, name=f"T{i}", created_by=self.owner) for i in range(3)]
+
+    async def get(self, name, user, *args):
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        return await AsyncClient().get(reverse(name, args=args), headers=headers)
+
+    def sync_get(self, path, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(path).json()
+
+    async def test_requests_without_a_valid_token_are_rejected(self):
+        client = AsyncClient()
+        self.assertEqual((await client.get(reverse("async-task-list"))).status_code, 401)
+        response = await client.get(reverse("async-task-list"), headers={"Authorization": "Bearer nope"})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_non_members_do_not_see_other_projects(self):
+        self.assertEqual((await self.get("async-task-list", self.outsider)).json()["count"], 0)
+        self.assertEqual((await self.get("async-project-list", self.outsider)).json()["results"], [])
+        response = await self.get("async-task-detail", self.outsider, self.tasks[0].pk)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_payloads_match_the_sync_endpoints(self):
+        for async_name, sync_name, args in (
+            ("async-task-list", "task-list", []),
+            ("async-project-list", "project-list", []),
+            ("async-task-detail", "task-detail", [self.tasks[1].pk]),
+            ("async-project-detail", "project-detail", [self.project.pk]),
+        ):
+            with self.subTest(async_name):
+                response = await self.get(async_name, self.owner, *args)
+                self.assertEqual(response.status_code, 200)
+                expected = await sync_to_async(self.sync_get)(reverse(sync_name, args=args), self.owner)
+                expected.pop("count_is_approximate", None)
+                self.assertEqual(response.json(), expected)
@@ -0,0 +1,79 @@
+import math
+import time
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Turn `"120/min"` into `(limit, period_seconds)`; `None` means unlimited."""
+
+    if not rate:
+        return None
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+class RoleRateThrottle(BaseThrottle):
+    """Sliding-window throttle with rates per endpoint scope and `User.Roles` role.
+
+    The scope comes from the throttle class, else the view's `throttle_scope`, else
+    `"default"`; rates are looked up in `settings.ROLE_THROTTLE_RATES[scope][role]`,
+    falling back to the default scope. Anonymous clients use the `"anon"` role and are
+    keyed by IP. Each key keeps one counter per rate period in the shared cache,
+    bumped with atomic `cache.add`/`cache.incr`, so concurrent requests cannot read
+    the same state and all pass, and limits hold across workers when the cache is
+    Redis. The previous period's count is weighted by how much of it still falls in
+    the sliding window, which smooths the burst a fixed window allows at its edge.
+    """
+
+    scope: Optional[str] = None
+
+    def allow_request(self, request, view) -> bool:
+        scope = self.scope or getattr(view, "throttle_scope", None) or "default"
+        user = request.user
+        if user and user.is_authenticated:
+            role, ident = user.role, f"user:{user.pk}"
+        else:
+            role, ident = "anon", f"ip:{self.get_ident(request)}"
+
+        rates = settings.ROLE_THROTTLE_RATES
+        rate = rates.get(scope, {}).get(role, rates["default"].get(role))
+        parsed = parse_rate(rate)
+        if parsed is None:
+            return True
+        limit, period = parsed
+
+        window, elapsed = divmod(time.time(), period)
+        key = f"throttle:{scope}:{ident}"
+        current_key, previous_key = f"{key}:{int(window)}", f"{key}:{int(window) - 1}"
+        # Keep each counter until it has slid out of the following window too
+        timeout = math.ceil(period * 2) + 1
+        if cache.add(current_key, 1, timeout=timeout):
+            count = 1
+        else:
+            try:
+                count = cache.incr(current_key)
+            except ValueError:
+                # Expired between add and incr
+                cache.add(current_key, 0, timeout=timeout)
+                count = cache.incr(current_key)
+        previous = cache.get(previous_key, 0)
+        weighted = previous * (1 - elapsed / period) + count
+        if weighted <= limit:
+            return True
+        # Earliest point at which the weighted count drops back under the limit
+        over = weighted - limit
+        self.wait_seconds = min(period - elapsed, over / previous * period) if previous else period - elapsed
+        return False
+
+    def wait(self) -> Optional[float]:
+        return getattr(self, "wait_seconds", None)
+
+
+class RegisterRateThrottle(RoleRateThrottle):
+    scope = "register"
@@ -0,0 +1,56 @@
+"""Production gunicorn profile: `gunicorn -c gunicorn.conf.py` from `backend/`.
+
+The application is imported and warmed once in the master (`preload_app`), then
+workers are forked from it and share those pages copy-on-write. For the ASGI
+entrypoint set `GUNICORN_APP=project_management.asgi:application` and
+`GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker`.
+"""
+
+import gc
+import multiprocessing
+
+from decouple import config
+
+wsgi_app = config("GUNICORN_APP", default="project_management.wsgi:application")
+bind = config("GUNICORN_BIND", default="0.0.0.0:8000")
+workers = config("WEB_CONCURRENCY", default=multiprocessing.cpu_count() * 2 + 1, cast=int)
+worker_class = config("GUNICORN_WORKER_CLASS", default="gthread")
+threads = config("GUNICORN_THREADS", default=4, cast=int)
+preload_app = True
+timeout = config("GUNICORN_TIMEOUT", default=30, cast=int)
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers periodically; the jitter keeps them from restarting together
+max_requests = config("GUNICORN_MAX_REQUESTS", default=5000, cast=int)
+max_requests_jitter = max_requests // 10
+accesslog = "-"
+
+
+def when_ready(server):
+    # Move everything allocated while preloading into the permanent generation so
+    # the cyclic GC in workers does not touch (and un-share) those pages
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from django.db import connections
+
+    from core.metrics import registry
+
+    connections.close_all()
+    # Start from zero rather than from whatever the master recorded while preloading
+    registry.reset()
+
+
+def worker_exit(server, worker):
+    from core.metrics import registry
+
+    registry.flush()
+
+
+def child_exit(server, worker):
+    # Runs in the master once a worker is gone: keep its totals in the archive file
+    from core.metrics import registry
+
+    registry.archive(worker.pid)
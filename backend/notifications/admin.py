@@ -1,11 +1,15 @@
 from django.contrib import admin
 
+from core.paginator import EstimatedCountPaginator
 from .models import Notification
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ("user", "title", "is_read", "created_at")
+    list_select_related = ("user",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_filter = ("is_read", "created_at")
     search_fields = ("title", "message", "user__username", "user__email")
     autocomplete_fields = ("user",)
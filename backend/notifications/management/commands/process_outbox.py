@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import OutboxWorker
+
+
+class Command(BaseCommand):
+    help = "Run the notification outbox worker, turning task events into coalesced notifications."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain pending events once and exit.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when idle.")
+        parser.add_argument("--workers", type=int, default=settings.OUTBOX_WORKERS)
+        parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument(
+            "--coalesce-seconds",
+            type=int,
+            default=settings.OUTBOX_COALESCE_SECONDS,
+            help="Wait until a task has been quiet this long before notifying.",
+        )
+
+    def handle(self, *args, **options):
+        worker = OutboxWorker(
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            coalesce_seconds=options["coalesce_seconds"],
+        )
+        try:
+            while True:
+                created = worker.run_once()
+                if created:
+                    self.stdout.write(f"Created {created} notification(s).")
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Outbox worker stopped."))
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications.models import Notification, NotificationArchive, OutboxEvent
+from notifications.retention import expired_notifications, prune_notifications, prune_outbox, table_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete notifications past their read/unread TTL in small batches, optionally "
+        "moving them to the archive table, and prune processed outbox events."
+    )
+
+    def add_arguments(self, parser):
+        archive = parser.add_mutually_exclusive_group()
+        archive.add_argument("--archive", dest="archive", action="store_true", default=None)
+        archive.add_argument("--no-archive", dest="archive", action="store_false")
+        parser.add_argument("--batch-size", type=int, default=settings.NOTIFICATION_PRUNE_BATCH_SIZE)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows have expired.")
+
+    def handle(self, *args, **options):
+        models = (Notification, NotificationArchive, OutboxEvent)
+        before = {model: table_stats(model) for model in models}
+        self._report("before", before)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{expired_notifications().count()} notification(s) past their TTL.")
+            return
+
+        removed = prune_notifications(
+            archive=options["archive"], batch_size=options["batch_size"], pause=options["pause"]
+        )
+        events = prune_outbox(batch_size=options["batch_size"])
+
+        self._report("after", {model: table_stats(model) for model in models})
+        self.stdout.write(
+            self.style.SUCCESS(f"Pruned {removed} notification(s) and {events} processed outbox event(s).")
+        )
+
+    def _report(self, label, stats):
+        for model, values in stats.items():
+            size = "n/a" if values["bytes"] is None else f"{values['bytes']} bytes"
+            self.stdout.write(f"[{label}] {model._meta.db_table}: {values['rows']} rows, {size}")
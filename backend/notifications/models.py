@@ -13,8 +13,71 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
-        indexes = [models.Index(fields=["user", "is_read"])]
+        indexes = [
+            models.Index(fields=["user", "is_read"]),
+            # Lets retention pruning find expired rows without scanning the table
+            models.Index(fields=["is_read", "created_at"]),
+        ]
 
     def __str__(self) -> str:
         return f"Notification for {self.user}: {self.title}"
 
+
+class NotificationArchive(models.Model):
+    """Cold storage for notifications moved out of the hot table by retention pruning.
+
+    Keeps the original primary key so archived rows can be traced back.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    title = models.CharField(max_length=255)
+    message = models.TextField(blank=True)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["user", "created_at"])]
+
+    def __str__(self) -> str:
+        return f"Archived notification for {self.user_id}: {self.title}"
+
+
+class OutboxEvent(models.Model):
+    """Append-only record of a task event waiting to be turned into notifications.
+
+    Rows are written cheaply from the request path and consumed by the outbox worker
+    (`manage.py process_outbox`), which coalesces bursts per task before fanning out.
+    """
+
+    class Kind(models.TextChoices):
+        TASK_CREATED = "task_created", "Task created"
+        TASK_ASSIGNED = "task_assigned", "Task assigned"
+        TASK_STATUS_CHANGED = "task_status_changed", "Task status changed"
+        TASK_UPDATED = "task_updated", "Task updated"
+        COMMENT_ADDED = "comment_added", "Comment added"
+
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    task = models.ForeignKey("tasks.Task", on_delete=models.CASCADE, related_name="outbox_events")
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    # Lease taken by an outbox worker; expired leases are claimable again
+    claimed_by = models.CharField(max_length=32, blank=True, default="")
+    claimed_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["processed_at", "created_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.kind} on task {self.task_id}"
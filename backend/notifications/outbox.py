@@ -0,0 +1,189 @@
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from projects.models import ProjectMembership
+from tasks.models import Task
+from .models import Notification, OutboxEvent
+
+
+def record_task_change(task, actor, previous: Optional[Dict] = None) -> None:
+    """Append outbox rows describing a task create/update.
+
+    `previous` holds the task's `status` and `assignee_id` before the save; it is
+    `None` for newly created tasks. Call it in the same transaction as the save, so
+    the events are never written for a change that rolled back (or lost for one that
+    committed).
+    """
+
+    events = []
+    if previous is None:
+        events.append(OutboxEvent(kind=OutboxEvent.Kind.TASK_CREATED, task=task, actor=actor))
+        if task.assignee_id:
+            events.append(OutboxEvent(kind=OutboxEvent.Kind.TASK_ASSIGNED, task=task, actor=actor))
+    else:
+        if task.assignee_id and task.assignee_id != previous["assignee_id"]:
+            events.append(OutboxEvent(kind=OutboxEvent.Kind.TASK_ASSIGNED, task=task, actor=actor))
+        if task.status != previous["status"]:
+            events.append(
+                OutboxEvent(
+                    kind=OutboxEvent.Kind.TASK_STATUS_CHANGED,
+                    task=task,
+                    actor=actor,
+                    payload={"from": previous["status"], "to": task.status},
+                )
+            )
+        if not events:
+            events.append(OutboxEvent(kind=OutboxEvent.Kind.TASK_UPDATED, task=task, actor=actor))
+    OutboxEvent.objects.bulk_create(events)
+
+
+def record_comment(comment, actor) -> None:
+    """Append the outbox row for a new comment, in the comment's transaction."""
+
+    OutboxEvent.objects.create(
+        kind=OutboxEvent.Kind.COMMENT_ADDED,
+        task_id=comment.task_id,
+        actor=actor,
+        payload={"comment": comment.id},
+    )
+
+
+class OutboxWorker:
+    """Turn pending outbox events into notifications in coalesced batches.
+
+    Events for a task are only picked up once the task has been quiet for
+    `coalesce_seconds` (or its oldest event exceeds `max_delay_seconds`), so a burst of
+    edits produces a single notification per recipient. Each claimed batch is split
+    by task across a thread pool; every thread resolves recipients with one query per
+    relation and writes its notifications with a single `bulk_create`.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        coalesce_seconds: Optional[int] = None,
+    ):
+        self.workers = workers or settings.OUTBOX_WORKERS
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.coalesce_seconds = settings.OUTBOX_COALESCE_SECONDS if coalesce_seconds is None else coalesce_seconds
+        self.max_delay_seconds = max(self.coalesce_seconds * 10, 60)
+
+    def claim(self) -> List[OutboxEvent]:
+        """Lease the next batch of ready events to this worker.
+
+        Candidates are leased with a conditional UPDATE, so when several workers race
+        for the same rows only one of them gets each row. Leases expire after
+        `OUTBOX_CLAIM_SECONDS`, so events of a crashed worker are picked up again.
+        """
+
+        now = timezone.now()
+        unclaimed = models.Q(claimed_until__isnull=True) | models.Q(claimed_until__lt=now)
+        busy_tasks = OutboxEvent.objects.filter(
+            processed_at__isnull=True,
+            created_at__gt=now - timedelta(seconds=self.coalesce_seconds),
+        ).values("task_id")
+        candidates = list(
+            OutboxEvent.objects.filter(unclaimed, processed_at__isnull=True)
+            .exclude(
+                models.Q(task_id__in=busy_tasks)
+                & models.Q(created_at__gt=now - timedelta(seconds=self.max_delay_seconds))
+            )
+            .order_by("id")
+            .values_list("id", flat=True)[: self.batch_size]
+        )
+        if not candidates:
+            return []
+        token = uuid.uuid4().hex
+        OutboxEvent.objects.filter(unclaimed, id__in=candidates, processed_at__isnull=True).update(
+            claimed_by=token, claimed_until=now + timedelta(seconds=settings.OUTBOX_CLAIM_SECONDS)
+        )
+        return list(OutboxEvent.objects.filter(id__in=candidates, claimed_by=token).order_by("id"))
+
+    def run_once(self) -> int:
+        """Process one batch and return the number of notifications created."""
+
+        events = self.claim()
+        if not events:
+            return 0
+        shards: Dict[int, List[OutboxEvent]] = defaultdict(list)
+        for event in events:
+            shards[event.task_id % self.workers].append(event)
+        if len(shards) == 1:
+            return self.deliver(next(iter(shards.values())))
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="outbox") as pool:
+            return sum(pool.map(self._deliver_in_thread, shards.values()))
+
+    def _deliver_in_thread(self, events: List[OutboxEvent]) -> int:
+        try:
+            return self.deliver(events)
+        finally:
+            connection.close()
+
+    def deliver(self, events: List[OutboxEvent]) -> int:
+        by_task: Dict[int, List[OutboxEvent]] = defaultdict(list)
+        for event in events:
+            by_task[event.task_id].append(event)
+
+        tasks = {
+            row["id"]: row
+            for row in Task.objects.filter(id__in=by_task).values(
+                "id", "name", "project_id", "assignee_id", "created_by_id"
+            )
+        }
+        members: Dict[int, set] = defaultdict(set)
+        project_ids = {task["project_id"] for task in tasks.values()}
+        for project_id, user_id in ProjectMembership.objects.filter(project_id__in=project_ids).values_list(
+            "project_id", "user_id"
+        ):
+            members[project_id].add(user_id)
+
+        notifications = []
+        for task_id, task_events in by_task.items():
+            task = tasks.get(task_id)
+            if task is None:
+                continue
+            recipients = set(members[task["project_id"]])
+            recipients.update(uid for uid in (task["assignee_id"], task["created_by_id"]) if uid)
+            for user_id in recipients:
+                visible = [event for event in task_events if event.actor_id != user_id]
+                if visible:
+                    notifications.append(self.build_notification(task, user_id, visible))
+
+        with transaction.atomic():
+            Notification.objects.bulk_create(notifications, batch_size=self.batch_size)
+            OutboxEvent.objects.filter(id__in=[event.id for event in events]).update(processed_at=timezone.now())
+        return len(notifications)
+
+    @staticmethod
+    def build_notification(task: Dict, user_id: int, events: Iterable[OutboxEvent]) -> Notification:
+        kinds = defaultdict(list)
+        for event in events:
+            kinds[event.kind].append(event)
+
+        lines = []
+        if OutboxEvent.Kind.TASK_CREATED in kinds:
+            lines.append("The task was created.")
+        if OutboxEvent.Kind.TASK_ASSIGNED in kinds and task["assignee_id"] == user_id:
+            lines.append("You were assigned to this task.")
+        elif OutboxEvent.Kind.TASK_ASSIGNED in kinds:
+            lines.append("The task was reassigned.")
+        if OutboxEvent.Kind.TASK_STATUS_CHANGED in kinds:
+            lines.append(f"Status changed to {kinds[OutboxEvent.Kind.TASK_STATUS_CHANGED][-1].payload['to']}.")
+        if OutboxEvent.Kind.COMMENT_ADDED in kinds:
+            lines.append(f"{len(kinds[OutboxEvent.Kind.COMMENT_ADDED])} new comment(s).")
+        if OutboxEvent.Kind.TASK_UPDATED in kinds and not lines:
+            lines.append("The task details were updated.")
+
+        if kinds.keys() == {OutboxEvent.Kind.TASK_ASSIGNED} and task["assignee_id"] == user_id:
+            title = f"Assigned: {task['name']}"
+        else:
+            title = f"Activity on task: {task['name']}"
+        return Notification(user_id=user_id, title=title[:255], message="\n".join(lines))
@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connection, models, transaction
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive, OutboxEvent
+
+ARCHIVED_FIELDS = ("id", "user_id", "title", "message", "is_read", "created_at")
+
+
+def expired_notifications(now=None) -> models.QuerySet:
+    """Notifications past their TTL: read ones age out sooner than unread ones."""
+
+    now = now or timezone.now()
+    read_cutoff = now - timedelta(days=settings.NOTIFICATION_READ_TTL_DAYS)
+    unread_cutoff = now - timedelta(days=settings.NOTIFICATION_UNREAD_TTL_DAYS)
+    return Notification.objects.filter(
+        models.Q(is_read=True, created_at__lt=read_cutoff) | models.Q(is_read=False, created_at__lt=unread_cutoff)
+    )
+
+
+def prune_notifications(
+    archive: Optional[bool] = None,
+    batch_size: Optional[int] = None,
+    pause: float = 0.0,
+    now=None,
+) -> int:
+    """Delete (optionally archiving first) expired notifications in short transactions.
+
+    Each round selects at most `batch_size` ids through the `(is_read, created_at)`
+    index and deletes them by primary key, so locks are held only for one small batch.
+    Returns the number of rows removed from the hot table.
+    """
+
+    archive = settings.NOTIFICATION_ARCHIVE if archive is None else archive
+    batch_size = batch_size or settings.NOTIFICATION_PRUNE_BATCH_SIZE
+    expired = expired_notifications(now).order_by()
+    removed = 0
+    while True:
+        ids = list(expired.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            if archive:
+                rows = Notification.objects.filter(id__in=ids).values(*ARCHIVED_FIELDS)
+                NotificationArchive.objects.bulk_create(
+                    [NotificationArchive(**row) for row in rows], ignore_conflicts=True
+                )
+            Notification.objects.filter(id__in=ids).delete()
+        removed += len(ids)
+        if pause:
+            time.sleep(pause)
+    return removed
+
+
+def prune_outbox(batch_size: Optional[int] = None, now=None) -> int:
+    """Delete processed outbox events older than `OUTBOX_RETENTION_DAYS`, batch by batch."""
+
+    batch_size = batch_size or settings.NOTIFICATION_PRUNE_BATCH_SIZE
+    cutoff = (now or timezone.now()) - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    processed = OutboxEvent.objects.filter(processed_at__lt=cutoff).order_by()
+    removed = 0
+    while True:
+        ids = list(processed.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        OutboxEvent.objects.filter(id__in=ids).delete()
+        removed += len(ids)
+    return removed
+
+
+def table_stats(model) -> Dict[str, Optional[int]]:
+    """Row count and on-disk size in bytes (when the backend can report it) for `model`."""
+
+    table = model._meta.db_table
+    size = None
+    queries = {
+        "postgresql": ("SELECT pg_total_relation_size(%s)", [table]),
+        "sqlite": ("SELECT SUM(pgsize) FROM dbstat WHERE name = %s", [table]),
+        "mysql": (
+            "SELECT data_length + index_length FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s",
+            [table],
+        ),
+    }
+    if connection.vendor in queries:
+        sql, params = queries[connection.vendor]
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+            size = int(row[0]) if row and row[0] is not None else None
+        except DatabaseError:
+            # e.g. SQLite builds without the dbstat virtual table
+            size = None
+    return {"rows": model.objects.count(), "bytes": size}
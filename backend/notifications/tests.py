@@ -1,3 +1,70 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from core.testing import AdminQueryBudgetMixin
+from projects.models import Project
+from tasks.models import Task
+from .models import Notification, OutboxEvent
+from .outbox import OutboxWorker
+
+
+class NotificationAdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = cls.create_admin_user()
+        users = User.objects.bulk_create([User(username=f"user{i}") for i in range(30)])
+        Notification.objects.bulk_create([Notification(user=user, title="Hello") for user in users])
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_notification_changelist(self):
+        self.assertChangelistWithinBudget(reverse("admin:notifications_notification_changelist"), 6)
+
+
+class OutboxClaimTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass1234")
+        project = Project.objects.create(name="Project", created_by=cls.user)
+        tasks = Task.objects.bulk_create([Task(project=project, name=f"Task {i}", created_by=cls.user) for i in range(4)])
+        OutboxEvent.objects.bulk_create(
+            [OutboxEvent(kind=OutboxEvent.Kind.TASK_UPDATED, task=task, actor=cls.user) for task in tasks]
+        )
+
+    def test_workers_do_not_claim_the_same_events(self):
+        first = OutboxWorker(batch_size=3, coalesce_seconds=0).claim()
+        second = OutboxWorker(batch_size=3, coalesce_seconds=0).claim()
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 1)
+        self.assertFalse({event.pk for event in first} & {event.pk for event in second})
+        self.assertEqual(OutboxWorker(coalesce_seconds=0).claim(), [])
+
+    @override_settings(OUTBOX_CLAIM_SECONDS=60)
+    def test_expired_leases_are_claimed_again(self):
+        claimed = OutboxWorker(coalesce_seconds=0).claim()
+        OutboxEvent.objects.filter(pk=claimed[0].pk).update(claimed_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual([event.pk for event in OutboxWorker(coalesce_seconds=0).claim()], [claimed[0].pk])
+
+
+class OutboxTransactionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.project = Project.objects.create(name="Project", created_by=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_failed_save_rolls_back_the_outbox_rows(self):
+        with mock.patch("tasks.views.record_created", side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            self.client.post(reverse("task-list"), {"project": self.project.pk, "name": "Task"}, format="json")
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(OutboxEvent.objects.exists())
@@ -17,6 +17,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
 
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "notifications"
 
     def get_queryset(self):
         user: User = self.request.user
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -49,13 +50,17 @@ INSTALLED_APPS = [
     'drf_spectacular',
     
     # Local apps
+    'core',
     'authentication',
     'projects',
     'tasks',
     'notifications',
+    'activity',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ConcurrencyLimitMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -64,10 +69,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'activity.middleware.ActivityLogMiddleware',
 ]
 
 ROOT_URLCONF = 'project_management.urls'
 
+# Import views, compile URL resolvers and build serializer fields when the WSGI/ASGI
+# application loads (see project_management/warmup.py and gunicorn.conf.py)
+WARM_UP_ON_BOOT = config('WARM_UP_ON_BOOT', default=True, cast=bool)
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -98,6 +108,26 @@ DATABASES = {
 }
 
 
+# Cache
+# Redis is shared across workers (throttle counters etc.); fall back to per-process memory
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -145,12 +175,12 @@ AUTH_USER_MODEL = 'authentication.User'
 # Django REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.backends.TimedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -158,8 +188,81 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.RoleRateThrottle',
+    ],
 }
 
+# Sliding-window rates ("limit/period") per endpoint scope (view `throttle_scope`)
+# and user role, enforced by core.throttling.RoleRateThrottle.
+# Roles missing from a scope use the "default" scope; None means unlimited.
+ROLE_THROTTLE_RATES = {
+    'default': {
+        'admin': None,
+        'collaborator': '600/min',
+        'viewer': '300/min',
+        'anon': '60/min',
+    },
+    'notifications': {
+        'admin': '120/min',
+        'collaborator': '60/min',
+        'viewer': '60/min',
+    },
+    'register': {'anon': '5/min'},
+    'login': {'anon': '10/min'},
+}
+
+# Per-process admission control (0 disables); excess requests get 503 after the timeout
+MAX_CONCURRENT_REQUESTS = config('MAX_CONCURRENT_REQUESTS', default=64, cast=int)
+CONCURRENCY_QUEUE_TIMEOUT = config('CONCURRENCY_QUEUE_TIMEOUT', default=2.0, cast=float)
+
+# Bulk CSV/NDJSON imports: rows validated and inserted per transaction
+IMPORT_BATCH_SIZE = config('IMPORT_BATCH_SIZE', default=1000, cast=int)
+
+# Horizon (in days) for the `due=soon` task filter and the daily due-soon digest
+DUE_SOON_DAYS = config('DUE_SOON_DAYS', default=3, cast=int)
+
+# Notification outbox worker (`manage.py process_outbox`)
+OUTBOX_COALESCE_SECONDS = config('OUTBOX_COALESCE_SECONDS', default=30, cast=int)
+OUTBOX_BATCH_SIZE = config('OUTBOX_BATCH_SIZE', default=500, cast=int)
+OUTBOX_WORKERS = config('OUTBOX_WORKERS', default=4, cast=int)
+OUTBOX_CLAIM_SECONDS = config('OUTBOX_CLAIM_SECONDS', default=300, cast=int)
+
+# Notification retention (`manage.py prune_notifications`)
+NOTIFICATION_READ_TTL_DAYS = config('NOTIFICATION_READ_TTL_DAYS', default=30, cast=int)
+NOTIFICATION_UNREAD_TTL_DAYS = config('NOTIFICATION_UNREAD_TTL_DAYS', default=180, cast=int)
+NOTIFICATION_PRUNE_BATCH_SIZE = config('NOTIFICATION_PRUNE_BATCH_SIZE', default=1000, cast=int)
+NOTIFICATION_ARCHIVE = config('NOTIFICATION_ARCHIVE', default=False, cast=bool)
+OUTBOX_RETENTION_DAYS = config('OUTBOX_RETENTION_DAYS', default=7, cast=int)
+
+# Widest date window accepted by the project timeline endpoint
+TIMELINE_MAX_DAYS = config('TIMELINE_MAX_DAYS', default=366, cast=int)
+
+# Above this many rows, list counts (API pagination and admin changelists) become
+# estimates: planner statistics when unfiltered, otherwise a periodically cached COUNT(*)
+ESTIMATED_COUNT_THRESHOLD = config('ESTIMATED_COUNT_THRESHOLD', default=10000, cast=int)
+ESTIMATED_COUNT_CACHE_SECONDS = config('ESTIMATED_COUNT_CACHE_SECONDS', default=300, cast=int)
+
+# Cards per status column returned by the task board (default / upper bound)
+BOARD_COLUMN_SIZE = config('BOARD_COLUMN_SIZE', default=20, cast=int)
+BOARD_MAX_COLUMN_SIZE = config('BOARD_MAX_COLUMN_SIZE', default=100, cast=int)
+
+# Soft-deleted projects and tasks are physically removed by `purge_deleted` after this
+PURGE_DELETED_AFTER_DAYS = config('PURGE_DELETED_AFTER_DAYS', default=7, cast=int)
+PURGE_CHUNK_SIZE = config('PURGE_CHUNK_SIZE', default=1000, cast=int)
+
+# Lifetime of the cached org-wide task workload summary
+WORKLOAD_CACHE_SECONDS = config('WORKLOAD_CACHE_SECONDS', default=60, cast=int)
+
+# Board columns holding a rank longer than this are respaced by `rebalance_task_ranks`
+TASK_RANK_REBALANCE_LENGTH = config('TASK_RANK_REBALANCE_LENGTH', default=12, cast=int)
+
+# Members embedded per project by `?include=members`; the full list is paginated
+PROJECT_MEMBERS_INLINE_LIMIT = config('PROJECT_MEMBERS_INLINE_LIMIT', default=100, cast=int)
+
+# Write-through cache of task/project detail payloads and per-user memberships
+SNAPSHOT_CACHE_SECONDS = config('SNAPSHOT_CACHE_SECONDS', default=3600, cast=int)
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -187,6 +290,8 @@ SIMPLE_JWT = {
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='http://localhost:3000,http://127.0.0.1:3000').split(',')
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
 
 # API Documentation
 SPECTACULAR_SETTINGS = {
@@ -195,3 +300,22 @@ SPECTACULAR_SETTINGS = {
     'VERSION': '1.0.0',
     'SERVE_INCLUDE_SCHEMA': False,
 }
+
+# Prebuilt schema served by /api/schema/ outside DEBUG (`manage.py build_openapi_schema`)
+OPENAPI_SCHEMA_DIR = config('OPENAPI_SCHEMA_DIR', default=str(BASE_DIR / 'openapi'))
+
+# In-process metrics scraped at /metrics (core/metrics.py). With several worker
+# processes point METRICS_DIR at a directory they share (emptied on deploy).
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_FLUSH_SECONDS = config('METRICS_FLUSH_SECONDS', default=5.0, cast=float)
+# Matched against REMOTE_ADDR, i.e. the proxy's address behind a reverse proxy;
+# set METRICS_TOKEN there to also require `Authorization: Bearer <token>`.
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1').split(',')
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Responses stored for POST retries carrying an Idempotency-Key (core/idempotency.py)
+IDEMPOTENCY_KEY_TTL_SECONDS = config('IDEMPOTENCY_KEY_TTL_SECONDS', default=86400, cast=int)
+IDEMPOTENCY_LOCK_SECONDS = config('IDEMPOTENCY_LOCK_SECONDS', default=30, cast=int)
+
+# POST /api/batch/: GET sub-requests per batch (run one after another)
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
@@ -0,0 +1,67 @@
+"""Boot-time warm-up so a worker's first request costs the same as its hundredth.
+
+Called from `wsgi.py`/`asgi.py` when `WARM_UP_ON_BOOT` is set. With gunicorn's
+`preload_app` this runs once in the master and every forked worker inherits the
+warmed state copy-on-write.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import translation
+
+
+def _callbacks(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _callbacks(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern.callback
+
+
+def warm_up() -> None:
+    # Importing the URLconf imports every view module; populating the resolvers
+    # compiles all route regexes and builds the reverse() lookup tables
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            pattern.reverse_dict
+
+    # DRF resolves its dotted-path settings lazily; touching them imports the
+    # authentication, permission, throttle, filter and pagination classes
+    from rest_framework.settings import api_settings
+
+    for name in (
+        "DEFAULT_AUTHENTICATION_CLASSES",
+        "DEFAULT_PERMISSION_CLASSES",
+        "DEFAULT_THROTTLE_CLASSES",
+        "DEFAULT_FILTER_BACKENDS",
+        "DEFAULT_PAGINATION_CLASS",
+        "DEFAULT_RENDERER_CLASSES",
+        "DEFAULT_PARSER_CLASSES",
+    ):
+        getattr(api_settings, name)
+
+    # Building each viewset's serializer fields fills the model _meta caches and
+    # imports field classes; no queries run because relation querysets are lazy
+    seen = set()
+    for callback in _callbacks(resolver.url_patterns):
+        view_class = getattr(callback, "cls", None)
+        serializer_class = getattr(view_class, "serializer_class", None)
+        if serializer_class is None or serializer_class in seen:
+            continue
+        seen.add(serializer_class)
+        serializer_class().fields
+
+    # Compiling (not executing) one query per model primes the ORM's per-process
+    # expression and lookup caches that otherwise fill during the first requests
+    for model in apps.get_models():
+        str(model._default_manager.all().query)
+
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.deactivate()
+
+    # Never hand a database connection opened during warm-up to forked workers
+    connections.close_all()
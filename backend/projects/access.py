@@ -0,0 +1,46 @@
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from authentication.models import User
+from core.metrics import record_cache
+from .models import ProjectMembership
+
+
+def _memberships_key(user_id) -> str:
+    return f"memberships:{user_id}"
+
+
+def membership_roles(user: User) -> Dict[int, str]:
+    """Map of project id to membership role for `user`.
+
+    Memoized on the user object for the rest of the request and cached across
+    requests until a membership of that user changes.
+    """
+
+    roles = getattr(user, "_membership_roles", None)
+    if roles is None:
+        roles = cache.get(_memberships_key(user.pk))
+        record_cache("memberships", roles is not None)
+        if roles is None:
+            roles = dict(ProjectMembership.objects.filter(user_id=user.pk).values_list("project_id", "role"))
+            cache.set(_memberships_key(user.pk), roles, settings.SNAPSHOT_CACHE_SECONDS)
+        user._membership_roles = roles
+    return roles
+
+
+def invalidate_memberships(user_ids: Iterable[int]) -> None:
+    cache.delete_many([_memberships_key(user_id) for user_id in user_ids])
+
+
+def can_view(user: User, project_id: int, created_by_id: int) -> bool:
+    """Read visibility of a project or task, evaluated from cached memberships.
+
+    Mirrors the viewset querysets: admins see everything, other users see objects
+    they created and anything in projects they are members of.
+    """
+
+    if user.role == User.Roles.ADMIN:
+        return True
+    return created_by_id == user.pk or project_id in membership_roles(user)
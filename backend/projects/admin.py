@@ -1,11 +1,15 @@
 from django.contrib import admin
 
+from core.paginator import EstimatedCountPaginator
 from .models import Project, ProjectMembership
 
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     list_display = ("name", "status", "start_date", "end_date", "created_by", "created_at")
+    list_select_related = ("created_by",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_filter = ("status", "start_date", "end_date", "created_at")
     search_fields = ("name", "description")
     autocomplete_fields = ("created_by",)
@@ -14,6 +18,9 @@ class ProjectAdmin(admin.ModelAdmin):
 @admin.register(ProjectMembership)
 class ProjectMembershipAdmin(admin.ModelAdmin):
     list_display = ("project", "user", "role", "assigned_at")
+    list_select_related = ("project", "user")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_filter = ("role", "assigned_at")
     search_fields = ("project__name", "user__username", "user__email")
     autocomplete_fields = ("project", "user")
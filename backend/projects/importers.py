@@ -0,0 +1,269 @@
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+from authentication.models import User
+from .models import Project
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+MAX_REPORTED_ERRORS = 1000
+
+
+class UnreadableFileError(ValueError):
+    """The upload is not valid UTF-8 text or not well-formed CSV.
+
+    Batches before the unreadable part were already imported; `result` reports them.
+    """
+
+    def __init__(self, message: str, result: "ImportResult"):
+        super().__init__(message)
+        self.result = result
+
+
+def detect_format(filename: str, explicit: Optional[str] = None) -> str:
+    """Return the import format from an explicit value or the file extension."""
+
+    fmt = (explicit or "").lower()
+    if not fmt:
+        name = (filename or "").lower()
+        if name.endswith(".csv"):
+            fmt = "csv"
+        elif name.endswith((".ndjson", ".jsonl")):
+            fmt = "ndjson"
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported import format; use one of: {', '.join(SUPPORTED_FORMATS)}.")
+    return fmt
+
+
+def read_rows(stream, fmt: str) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield `(row, error)` pairs from a binary or text stream without loading it whole."""
+
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            # Empty cells mean "not provided" so optional fields fall back to defaults
+            yield {k: v for k, v in row.items() if k and v not in ("", None)}, None
+        return
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield None, "Each line must be a JSON object."
+            continue
+        yield row, None
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return self.created + self.failed
+
+    @property
+    def rows_per_second(self) -> float:
+        return round(self.rows / self.elapsed, 1) if self.elapsed else 0.0
+
+    def add_error(self, row_number: int, errors: Any) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+class BulkImporter:
+    """Stream rows from a CSV/NDJSON file and insert them with chunked `bulk_create`.
+
+    Subclasses declare a `row_serializer_class` that validates scalar fields only,
+    resolve foreign keys for a whole batch in `preload` (one query per relation instead
+    of one per row), and turn a validated row into an unsaved instance in `build`.
+    """
+
+    model = None
+    row_serializer_class = None
+
+    def __init__(self, user: User, batch_size: Optional[int] = None):
+        self.user = user
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+
+    def run(self, stream, fmt: str) -> ImportResult:
+        result = ImportResult()
+        started = time.perf_counter()
+        try:
+            for batch in chunked(enumerate(read_rows(stream, fmt), start=1), self.batch_size):
+                self._import_batch(batch, result)
+        except UnicodeDecodeError as exc:
+            result.elapsed = time.perf_counter() - started
+            raise UnreadableFileError(f"File is not valid UTF-8 text ({exc.reason} at byte {exc.start}).", result)
+        except csv.Error as exc:
+            result.elapsed = time.perf_counter() - started
+            raise UnreadableFileError(f"Malformed CSV: {exc}.", result)
+        result.errors.sort(key=lambda error: error["row"])
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def preload(self, rows: List[Dict[str, Any]]) -> None:
+        """Resolve the references used by `rows` before they are built."""
+
+    def build(self, row: Dict[str, Any]):
+        raise NotImplementedError
+
+    def prepare(self, objs: List) -> None:
+        """Adjust a batch of built instances right before they are inserted."""
+
+    def _import_batch(self, batch, result: ImportResult) -> None:
+        validated = []
+        for row_number, (row, error) in batch:
+            if error:
+                result.add_error(row_number, {"non_field_errors": [error]})
+                continue
+            serializer = self.row_serializer_class(data=row)
+            if not serializer.is_valid():
+                result.add_error(row_number, serializer.errors)
+                continue
+            validated.append((row_number, serializer.validated_data))
+
+        self.preload([data for _, data in validated])
+
+        objs, numbers = [], []
+        for row_number, data in validated:
+            try:
+                objs.append(self.build(data))
+            except serializers.ValidationError as exc:
+                result.add_error(row_number, exc.detail)
+                continue
+            numbers.append(row_number)
+
+        if not objs:
+            return
+        try:
+            with transaction.atomic():
+                self.prepare(objs)
+                self.model.objects.bulk_create(objs, batch_size=self.batch_size)
+        except DatabaseError as exc:
+            for row_number in numbers:
+                result.add_error(row_number, {"non_field_errors": [f"Database error: {exc}"]})
+            return
+        result.created += len(objs)
+
+
+def import_upload(importer: BulkImporter, request) -> Response:
+    """Run `importer` over the `file` upload of a multipart request and report the result."""
+
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response({"detail": "file is required"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        fmt = detect_format(upload.name, request.data.get("format"))
+    except ValueError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        result = importer.run(upload, fmt)
+    except UnreadableFileError as exc:
+        return Response({"detail": str(exc), **exc.result.as_dict()}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result.as_dict())
+
+
+class BaseImportCommand(BaseCommand):
+    """Shared `manage.py import_*` command running an importer over a local file."""
+
+    importer_class = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file to import.")
+        parser.add_argument("--user", required=True, help="Username recorded as creator of imported rows.")
+        parser.add_argument("--format", choices=SUPPORTED_FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+        try:
+            fmt = detect_format(options["path"], options["format"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        importer = self.importer_class(user, batch_size=options["batch_size"])
+        with open(options["path"], "rb") as fh:
+            try:
+                result = importer.run(fh, fmt)
+            except UnreadableFileError as exc:
+                raise CommandError(f"{exc} {exc.result.created} rows were imported before it.")
+
+        for error in result.errors:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.created} created, {result.failed} failed in {result.elapsed:.2f}s "
+                f"({result.rows_per_second} rows/s)"
+            )
+        )
+
+
+class ProjectImportRowSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+    start_date = serializers.DateField(required=False, allow_null=True, default=None)
+    end_date = serializers.DateField(required=False, allow_null=True, default=None)
+    status = serializers.ChoiceField(choices=Project.Status.choices, default=Project.Status.PENDING)
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        start: Optional[date] = attrs.get("start_date")
+        end: Optional[date] = attrs.get("end_date")
+        if start and end and end < start:
+            raise serializers.ValidationError({"end_date": ["End date cannot be before start date."]})
+        return attrs
+
+
+class ProjectImporter(BulkImporter):
+    """Import projects owned by the importing user."""
+
+    model = Project
+    row_serializer_class = ProjectImportRowSerializer
+
+    def build(self, row: Dict[str, Any]) -> Project:
+        return Project(created_by=self.user, **row)
@@ -0,0 +1,7 @@
+from projects.importers import BaseImportCommand, ProjectImporter
+
+
+class Command(BaseImportCommand):
+    help = "Bulk-import projects from a CSV or NDJSON file."
+
+    importer_class = ProjectImporter
@@ -0,0 +1,67 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.utils import timezone
+
+from projects.models import Project, ProjectMembership
+from tasks.models import Comment, Task
+
+
+def delete_in_chunks(queryset: models.QuerySet, chunk_size: int, pause: float = 0.0) -> int:
+    """Delete `queryset` by primary key, `chunk_size` rows per short transaction."""
+
+    queryset = queryset.order_by()
+    removed = 0
+    while True:
+        ids = list(queryset.values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            return removed
+        with transaction.atomic():
+            queryset.model._base_manager.filter(id__in=ids).delete()
+        removed += len(ids)
+        if pause:
+            time.sleep(pause)
+
+
+class Command(BaseCommand):
+    help = (
+        "Physically remove projects and tasks soft-deleted more than PURGE_DELETED_AFTER_DAYS ago, "
+        "children first and in bounded chunks so no single transaction grows with project size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.PURGE_DELETED_AFTER_DAYS)
+        parser.add_argument("--chunk-size", type=int, default=settings.PURGE_CHUNK_SIZE)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between chunks.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        chunk, pause = options["chunk_size"], options["pause"]
+        projects = Project.all_objects.filter(deleted_at__lt=cutoff)
+        # Tasks of purged projects plus tasks deleted on their own
+        tasks = Task.all_objects.filter(
+            models.Q(deleted_at__lt=cutoff) | models.Q(project_id__in=projects.values("id"))
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"Would purge {projects.count()} project(s), {tasks.count()} task(s) and "
+                f"{Comment.objects.filter(task_id__in=tasks.values('id')).count()} comment(s)."
+            )
+            return
+
+        # Comments have no signals or dependants, so each chunk is a single DELETE;
+        # clearing them first keeps the task chunks from cascading into large sets
+        comments = delete_in_chunks(Comment.objects.filter(task_id__in=tasks.values("id")), chunk, pause)
+        task_count = delete_in_chunks(tasks, chunk, pause)
+        delete_in_chunks(ProjectMembership.objects.filter(project_id__in=projects.values("id")), chunk, pause)
+        project_count = delete_in_chunks(projects, chunk, pause)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Purged {project_count} project(s), {task_count} task(s) and {comments} comment(s)."
+            )
+        )
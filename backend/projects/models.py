@@ -1,12 +1,15 @@
 from django.db import models
 from django.conf import settings
 
+from core.models import DELETED, LIVE, SoftDeleteModel
 
-class Project(models.Model):
+
+class Project(SoftDeleteModel):
     """Represents a project within the platform.
 
     Only admins and collaborators can create or modify projects. Viewers can only
-    read projects they are members of via `ProjectMembership`.
+    read projects they are members of via `ProjectMembership`. Deleting a project
+    soft-deletes it together with its tasks.
     """
 
     class Status(models.TextChoices):
@@ -40,8 +43,10 @@ class Project(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=["status"]),
-            models.Index(fields=["start_date", "end_date"]),
+            models.Index(fields=["status"], condition=LIVE, name="project_status_live_idx"),
+            models.Index(fields=["start_date", "end_date"], condition=LIVE, name="project_dates_live_idx"),
+            # Lets purge_deleted find soft-deleted rows without scanning live ones
+            models.Index(fields=["deleted_at"], condition=DELETED, name="project_deleted_idx"),
         ]
         ordering = ["-created_at"]
 
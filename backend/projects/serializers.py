@@ -1,3 +1,6 @@
+from collections import Counter
+
+from django.conf import settings
 from rest_framework import serializers
 
 from authentication.models import User
@@ -13,9 +16,36 @@ class ProjectMembershipSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "assigned_at"]
 
 
+class MembershipEntrySerializer(serializers.Serializer):
+    user = serializers.IntegerField(min_value=1)
+    role = serializers.ChoiceField(choices=ProjectMembership.Role.choices, default=ProjectMembership.Role.VIEWER)
+
+
+class MembershipSetSerializer(serializers.Serializer):
+    """Desired `(user, role)` set for a project, validated with a single user lookup."""
+
+    members = MembershipEntrySerializer(many=True, allow_empty=True)
+
+    def validate_members(self, value):
+        user_ids = [entry["user"] for entry in value]
+        duplicates = sorted(uid for uid, count in Counter(user_ids).items() if count > 1)
+        if duplicates:
+            raise serializers.ValidationError(f"Users listed more than once: {duplicates}.")
+        missing = set(user_ids) - set(User.objects.filter(id__in=user_ids).values_list("id", flat=True))
+        if missing:
+            raise serializers.ValidationError(f"Users do not exist: {sorted(missing)}.")
+        return value
+
+
 class ProjectSerializer(serializers.ModelSerializer):
+    """Project with its member count.
+
+    Member ids are only embedded when the view passes a `members` map (project id to
+    user ids) in the context, as `ProjectViewSet` does for `?include=members`.
+    """
+
     created_by = serializers.PrimaryKeyRelatedField(read_only=True)
-    members = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    member_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
@@ -29,6 +59,32 @@ class ProjectSerializer(serializers.ModelSerializer):
             "created_by",
             "created_at",
             "updated_at",
-            "members",
+            "member_count",
         ]
-        read_only_fields = ["id", "created_by", "created_at", "updated_at", "members"]
+        read_only_fields = ["id", "created_by", "created_at", "updated_at"]
+
+    def get_member_count(self, obj) -> int:
+        # Annotated by ProjectViewSet.get_queryset; bare instances fall back to a COUNT
+        count = getattr(obj, "member_count", None)
+        return obj.memberships.count() if count is None else count
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        members = self.context.get("members")
+        if members is not None:
+            data["members"] = members.get(instance.pk, [])
+        return data
+
+
+class TimelineQuerySerializer(serializers.Serializer):
+    """Validates the `start`/`end` window of the timeline endpoint."""
+
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs["end"] < attrs["start"]:
+            raise serializers.ValidationError({"end": "End must not be before start."})
+        if (attrs["end"] - attrs["start"]).days > settings.TIMELINE_MAX_DAYS:
+            raise serializers.ValidationError(f"Window cannot exceed {settings.TIMELINE_MAX_DAYS} days.")
+        return attrs
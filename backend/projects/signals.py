@@ -0,0 +1,33 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.snapshots import project_snapshots
+from .access import invalidate_memberships
+from .models import Project, ProjectMembership
+from .snapshots import store_project_snapshot
+
+
+@receiver(post_save, sender=Project)
+def refresh_project_snapshot(sender, instance: Project, raw=False, **kwargs):
+    if raw:
+        return
+    if instance.deleted_at:
+        transaction.on_commit(lambda: project_snapshots.delete(instance.pk))
+    else:
+        transaction.on_commit(lambda: store_project_snapshot(instance))
+
+
+@receiver(post_delete, sender=Project)
+def drop_project_snapshot(sender, instance: Project, **kwargs):
+    transaction.on_commit(lambda: project_snapshots.delete(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=ProjectMembership)
+def membership_changed(sender, instance: ProjectMembership, **kwargs):
+    # Cached access checks and the project's member list both depend on memberships
+    def invalidate():
+        invalidate_memberships([instance.user_id])
+        project_snapshots.delete(instance.project_id)
+
+    transaction.on_commit(invalidate)
@@ -0,0 +1,13 @@
+from core.snapshots import project_snapshots
+from .serializers import ProjectSerializer
+
+
+def store_project_snapshot(project, data=None) -> None:
+    if data is None:
+        data = ProjectSerializer(project).data
+    project_snapshots.set(
+        project.pk,
+        project.updated_at.isoformat(),
+        dict(data),
+        {"project_id": project.pk, "created_by_id": project.created_by_id},
+    )
@@ -1,3 +1,267 @@
-from django.test import TestCase
+import re
+from datetime import date, timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from core.testing import AdminQueryBudgetMixin
+from tasks.models import Comment, Task
+from .access import membership_roles
+from .models import Project, ProjectMembership
+
+
+class ProjectAdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+    """Changelist query counts must not grow with the number of rows on the page."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = cls.create_admin_user()
+        users = User.objects.bulk_create([User(username=f"user{i}") for i in range(30)])
+        projects = Project.objects.bulk_create(
+            [Project(name=f"Project {i}", created_by=user) for i, user in enumerate(users)]
+        )
+        ProjectMembership.objects.bulk_create(
+            [ProjectMembership(project=project, user=user) for project, user in zip(projects, users)]
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_project_changelist(self):
+        self.assertChangelistWithinBudget(reverse("admin:projects_project_changelist"), 6)
+
+    def test_membership_changelist(self):
+        self.assertChangelistWithinBudget(reverse("admin:projects_projectmembership_changelist"), 6)
+
+
+class ProjectImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name, content):
+        return self.client.post(
+            reverse("project-import-file"), {"file": SimpleUploadedFile(name, content)}, format="multipart"
+        )
+
+    def test_csv_rows_are_imported(self):
+        response = self.upload("projects.csv", b"name,status\nAlpha,pending\nBeta,bogus\n")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["created"], response.data["failed"]), (1, 1))
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+
+    def test_non_utf8_file_is_rejected(self):
+        response = self.upload("projects.csv", "name\nCaf\u00e9\n".encode("latin-1"))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("UTF-8", response.data["detail"])
+        self.assertFalse(Project.objects.exists())
+
+    def test_malformed_csv_is_rejected(self):
+        response = self.upload("projects.csv", b"name\n" + b"x" * 200_000 + b"\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data["detail"].startswith("Malformed CSV"))
+
+
+class ProjectMembersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.alice, cls.bob, cls.carol = (User.objects.create_user(username=name) for name in ("alice", "bob", "carol"))
+        cls.project = Project.objects.create(name="Project", created_by=cls.owner)
+        ProjectMembership.objects.bulk_create(
+            [ProjectMembership(project=cls.project, user=user) for user in (cls.alice, cls.bob)]
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def put(self, *members):
+        return self.client.put(
+            reverse("project-members", args=[self.project.pk]), {"members": list(members)}, format="json"
+        )
+
+    def roles(self):
+        return dict(ProjectMembership.objects.filter(project=self.project).values_list("user_id", "role"))
+
+    def test_put_adds_removes_and_changes_roles(self):
+        self.assertEqual(membership_roles(User.objects.get(pk=self.bob.pk)), {self.project.pk: "viewer"})
+        response = self.put({"user": self.alice.pk, "role": "collaborator"}, {"user": self.carol.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"created": 1, "updated": 1, "deleted": 1})
+        self.assertEqual(self.roles(), {self.alice.pk: "collaborator", self.carol.pk: "viewer"})
+        # Cached memberships of removed users are dropped
+        self.assertEqual(membership_roles(User.objects.get(pk=self.bob.pk)), {})
+
+    def test_repeated_put_changes_nothing(self):
+        members = ({"user": self.alice.pk, "role": "collaborator"}, {"user": self.carol.pk})
+        self.put(*members)
+        before = list(ProjectMembership.objects.filter(project=self.project).order_by("id").values("id", "role"))
+        response = self.put(*members)
+        self.assertEqual(response.data, {"created": 0, "updated": 0, "deleted": 0})
+        after = list(ProjectMembership.objects.filter(project=self.project).order_by("id").values("id", "role"))
+        self.assertEqual(after, before)
+
+    def test_empty_put_removes_everyone(self):
+        self.assertEqual(self.put().data, {"created": 0, "updated": 0, "deleted": 2})
+        self.assertEqual(self.roles(), {})
+
+    def test_invalid_member_sets_are_rejected(self):
+        self.assertEqual(self.put({"user": self.alice.pk}, {"user": self.alice.pk}).status_code, 400)
+        self.assertEqual(self.put({"user": 999999}).status_code, 400)
+        self.assertEqual(self.roles(), {self.alice.pk: "viewer", self.bob.pk: "viewer"})
+
+    def test_viewers_cannot_replace_members(self):
+        self.client.force_authenticate(self.alice)
+        self.assertEqual(self.put({"user": self.alice.pk}).status_code, 403)
+
+
+class ProjectSoftDeleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.project = Project.objects.create(name="Doomed", created_by=cls.owner)
+        ProjectMembership.objects.create(project=cls.project, user=cls.owner, role=ProjectMembership.Role.COLLABORATOR)
+        cls.task = Task.objects.create(project=cls.project, name="Task", created_by=cls.owner)
+        Comment.objects.create(task=cls.task, author=cls.owner, content="hi")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def ids(self, name, **params):
+        return [row["id"] for row in self.client.get(reverse(name), params).data["results"]]
+
+    def test_deleted_project_hides_its_tasks_comments_and_memberships(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse("project-detail", args=[self.project.pk]))
+        self.assertEqual(response.status_code, 204)
+
+        self.assertEqual(self.client.get(reverse("project-detail", args=[self.project.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("task-detail", args=[self.task.pk])).status_code, 404)
+        self.assertEqual(self.ids("project-list"), [])
+        self.assertEqual(self.ids("task-list"), [])
+        self.assertEqual(self.ids("comment-list"), [])
+        self.assertEqual(self.ids("projectmembership-list"), [])
+        # The rows stay until purge_deleted removes them
+        self.assertIsNotNone(Project.all_objects.get(pk=self.project.pk).deleted_at)
+        self.assertIsNotNone(Task.all_objects.get(pk=self.task.pk).deleted_at)
+        self.assertEqual(Comment.objects.filter(task_id=self.task.pk).count(), 1)
+
+
+@override_settings(PURGE_DELETED_AFTER_DAYS=7)
+class PurgeDeletedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username="owner", password="pass1234")
+        cls.old, cls.recent, cls.live = (
+            Project.objects.create(name=name, created_by=cls.owner) for name in ("Old", "Recent", "Live")
+        )
+        for project in (cls.old, cls.recent, cls.live):
+            ProjectMembership.objects.create(project=project, user=cls.owner)
+            task = Task.objects.create(project=project, name=f"{project.name} task", created_by=cls.owner)
+            Comment.objects.create(task=task, author=cls.owner, content="hi")
+        now = timezone.now()
+        Project.objects.filter(pk=cls.old.pk).soft_delete()
+        Project.all_objects.filter(pk=cls.old.pk).update(deleted_at=now - timedelta(days=8))
+        Project.objects.filter(pk=cls.recent.pk).soft_delete()
+        Project.all_objects.filter(pk=cls.recent.pk).update(deleted_at=now - timedelta(days=6))
+
+    def purge(self, *args):
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command("purge_deleted", *args, stdout=out)
+        deleted = [re.match(r'DELETE FROM "(\w+)"', query["sql"]) for query in queries]
+        return out.getvalue(), [match.group(1) for match in deleted if match]
+
+    def test_only_projects_deleted_long_enough_ago_are_purged_children_first(self):
+        output, tables = self.purge("--chunk-size", "1")
+        self.assertIn("Purged 1 project(s), 1 task(s) and 1 comment(s).", output)
+        self.assertFalse(Project.all_objects.filter(pk=self.old.pk).exists())
+        self.assertFalse(Task.all_objects.filter(project_id=self.old.pk).exists())
+        self.assertFalse(Comment.objects.filter(task__project_id=self.old.pk).exists())
+        self.assertFalse(ProjectMembership.objects.filter(project_id=self.old.pk).exists())
+        for project in (self.recent, self.live):
+            self.assertTrue(Project.all_objects.filter(pk=project.pk).exists())
+            self.assertEqual(Comment.objects.filter(task__project_id=project.pk).count(), 1)
+        first = {table: tables.index(table) for table in tables}
+        self.assertLess(first["tasks_comment"], first["tasks_task"])
+        self.assertLess(first["tasks_task"], first["projects_projectmembership"])
+        self.assertLess(first["projects_projectmembership"], first["projects_project"])
+
+    def test_dry_run_removes_nothing(self):
+        output, tables = self.purge("--dry-run")
+        self.assertIn("Would purge 1 project(s), 1 task(s) and 1 comment(s).", output)
+        self.assertEqual(tables, [])
+        self.assertEqual(Project.all_objects.count(), 3)
+
+
+@override_settings(TIMELINE_MAX_DAYS=31)
+class ProjectTimelineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.outsider = User.objects.create_user(username="outsider", password="pass1234", role=User.Roles.COLLABORATOR)
+
+        def project(name, start, end):
+            return Project.objects.create(name=name, start_date=start, end_date=end, created_by=cls.owner)
+
+        cls.inside = project("Inside", date(2026, 3, 5), date(2026, 3, 10))
+        cls.overlapping = project("Overlapping", date(2026, 2, 20), date(2026, 3, 1))
+        cls.open_end = project("Open end", date(2026, 1, 1), None)
+        cls.open_start = project("Open start", None, date(2026, 3, 2))
+        project("Before", date(2026, 1, 1), date(2026, 2, 28))
+        project("After", date(2026, 4, 1), None)
+        cls.due = Task.objects.create(project=cls.inside, name="Due", due_date=date(2026, 3, 7), created_by=cls.owner)
+        Task.objects.create(project=cls.inside, name="Later", due_date=date(2026, 4, 7), created_by=cls.owner)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def timeline(self, start="2026-03-01", end="2026-03-31"):
+        return self.client.get(reverse("project-timeline"), {"start": start, "end": end})
+
+    def test_projects_overlapping_the_window_are_returned_as_columns(self):
+        response = self.timeline()
+        self.assertEqual(response.status_code, 200)
+        projects = response.data["projects"]
+        self.assertEqual(set(projects), {"id", "name", "status", "start_date", "end_date"})
+        self.assertCountEqual(
+            projects["id"], [self.inside.pk, self.overlapping.pk, self.open_end.pk, self.open_start.pk]
+        )
+        self.assertEqual(len(projects["name"]), 4)
+        self.assertEqual(response.data["tasks"]["id"], [self.due.pk])
+        self.assertEqual(response.data["tasks"]["project"], [self.inside.pk])
+
+    def test_empty_window_still_has_every_column(self):
+        response = self.timeline("2030-01-01", "2030-01-02")
+        self.assertEqual(response.data["tasks"], {name: [] for name in response.data["tasks"]})
+        self.assertEqual(len(response.data["tasks"]), 6)
+
+    def test_window_is_validated(self):
+        self.assertEqual(self.timeline("2026-03-10", "2026-03-01").status_code, 400)
+        self.assertEqual(self.timeline("2026-01-01", "2026-03-01").status_code, 400)
+        self.assertEqual(self.timeline("2026-01-01", "2026-02-01").status_code, 200)
+
+    def test_non_members_see_nothing(self):
+        self.client.force_authenticate(self.outsider)
+        response = self.timeline()
+        self.assertEqual(response.data["projects"]["id"], [])
+        self.assertEqual(response.data["tasks"]["id"], [])
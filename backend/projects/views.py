@@ -1,34 +1,132 @@
-from rest_framework import permissions, viewsets
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models.functions import Coalesce, RowNumber
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
-from django.db import models
+from django.db import IntegrityError, models, transaction
 
+from activity.log import record_created, record_updated, tracked_values
+from activity.views import ActivityHistoryMixin
 from authentication.models import User
+from core.snapshots import SnapshotRetrieveMixin, project_snapshots, task_snapshots
+from tasks.models import Task
+from .access import invalidate_memberships
+from .importers import ProjectImporter, import_upload
 from .models import Project, ProjectMembership
 from .permissions import IsAdminOrCollaborator, IsProjectMember
-from .serializers import ProjectMembershipSerializer, ProjectSerializer
+from .snapshots import store_project_snapshot
+from .serializers import (
+    MembershipSetSerializer,
+    ProjectMembershipSerializer,
+    ProjectSerializer,
+    TimelineQuerySerializer,
+)
+
+
+def columns(rows, names):
+    """Transpose `values_list` rows into `{name: [values...]}` parallel arrays."""
+
+    values = list(zip(*rows)) if rows else [()] * len(names)
+    return {name: list(column) for name, column in zip(names, values)}
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ActivityHistoryMixin, SnapshotRetrieveMixin, viewsets.ModelViewSet):
     """CRUD for projects with role-based permissions and membership filtering."""
 
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated & IsAdminOrCollaborator]
+    snapshot_cache = project_snapshots
 
     def get_queryset(self):
         user: User = self.request.user
+        member_count = (
+            ProjectMembership.objects.filter(project=models.OuterRef("pk"))
+            .order_by()
+            .values("project")
+            .annotate(count=models.Count("*"))
+            .values("count")
+        )
+        qs = Project.objects.select_related("created_by").annotate(
+            member_count=Coalesce(models.Subquery(member_count), 0)
+        )
         if user.role == User.Roles.ADMIN:
-            return Project.objects.all().select_related("created_by").prefetch_related("members")
-        # Show projects the user created or is a member of
-        return (
-            Project.objects.filter(models.Q(created_by=user) | models.Q(members=user))
-            .distinct()
-            .select_related("created_by")
-            .prefetch_related("members")
+            return qs
+        # Show projects the user created or is a member of; a subquery needs no DISTINCT
+        member_project_ids = ProjectMembership.objects.filter(user=user).values("project_id")
+        return qs.filter(models.Q(created_by=user) | models.Q(id__in=member_project_ids))
+
+    def includes_members(self) -> bool:
+        return "members" in self.request.query_params.get("include", "").split(",")
+
+    def member_map(self, projects):
+        """User ids of up to `PROJECT_MEMBERS_INLINE_LIMIT` members per project, in one query."""
+
+        limit = settings.PROJECT_MEMBERS_INLINE_LIMIT
+        rows = (
+            ProjectMembership.objects.filter(project_id__in=[project.pk for project in projects])
+            .annotate(
+                position=models.Window(RowNumber(), partition_by=models.F("project_id"), order_by=models.F("id").asc())
+            )
+            .filter(position__lte=limit)
+            .order_by("project_id", "id")
+            .values_list("project_id", "user_id")
         )
+        members = defaultdict(list)
+        for project_id, user_id in rows:
+            members[project_id].append(user_id)
+        return members
+
+    def list(self, request, *args, **kwargs):
+        if not self.includes_members():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        projects = list(queryset) if page is None else page
+        context = {**self.get_serializer_context(), "members": self.member_map(projects)}
+        data = self.get_serializer_class()(projects, many=True, context=context).data
+        return Response(data) if page is None else self.get_paginated_response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        # Cached snapshots never embed members, so ?include=members reads from the database
+        if not self.includes_members():
+            return super().retrieve(request, *args, **kwargs)
+        project = self.get_object()
+        context = {**self.get_serializer_context(), "members": self.member_map([project])}
+        return Response(self.get_serializer_class()(project, context=context).data)
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        project = serializer.save(created_by=self.request.user)
+        record_created(project, self.request.user)
+
+    def perform_update(self, serializer):
+        before = tracked_values(serializer.instance)
+        project = serializer.save()
+        record_updated(project, self.request.user, before)
+
+    def perform_destroy(self, instance):
+        """Soft-delete the project and its tasks with two UPDATEs; rows are purged later."""
+
+        now = timezone.now()
+        tasks = Task.objects.filter(project=instance)
+        with transaction.atomic():
+            task_ids = list(tasks.values_list("id", flat=True))
+            tasks.soft_delete(updated_at=now)
+            Project.objects.filter(pk=instance.pk).soft_delete(updated_at=now)
+
+        def invalidate():
+            project_snapshots.delete(instance.pk)
+            task_snapshots.delete_many(task_ids)
+
+        transaction.on_commit(invalidate)
+
+    def store_snapshot(self, instance, data):
+        store_project_snapshot(instance, data)
 
     @action(detail=True, methods=["get"], permission_classes=[permissions.IsAuthenticated & IsProjectMember])
     def memberships(self, request, pk=None):
@@ -36,6 +134,100 @@ class ProjectViewSet(viewsets.ModelViewSet):
         qs = ProjectMembership.objects.filter(project=project).select_related("user")
         return Response(ProjectMembershipSerializer(qs, many=True).data)
 
+    @action(detail=True, methods=["get", "put"])
+    def members(self, request, pk=None):
+        """List the project's memberships page by page, or replace them (PUT).
+
+        A PUT submits the desired `(user, role)` set; the diff against existing
+        memberships is computed in memory and applied with one delete, one
+        `bulk_create` and one `bulk_update` inside a transaction.
+        """
+
+        project = get_object_or_404(self.get_queryset(), pk=pk)
+        self.check_object_permissions(request, project)
+        if request.method == "GET":
+            page = self.paginate_queryset(ProjectMembership.objects.filter(project=project).order_by("id"))
+            return self.get_paginated_response(ProjectMembershipSerializer(page, many=True).data)
+        serializer = MembershipSetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        desired = {entry["user"]: entry["role"] for entry in serializer.validated_data["members"]}
+
+        try:
+            with transaction.atomic():
+                existing = {
+                    membership.user_id: membership
+                    for membership in ProjectMembership.objects.select_for_update().filter(project=project)
+                }
+                to_delete = [m.id for user_id, m in existing.items() if user_id not in desired]
+                to_create = [
+                    ProjectMembership(project=project, user_id=user_id, role=role)
+                    for user_id, role in desired.items()
+                    if user_id not in existing
+                ]
+                to_update = []
+                for user_id, membership in existing.items():
+                    if user_id in desired and membership.role != desired[user_id]:
+                        membership.role = desired[user_id]
+                        to_update.append(membership)
+
+                if to_delete:
+                    ProjectMembership.objects.filter(id__in=to_delete).delete()
+                ProjectMembership.objects.bulk_create(to_create)
+                ProjectMembership.objects.bulk_update(to_update, ["role"])
+        except IntegrityError:
+            return Response(
+                {"detail": "Memberships changed concurrently; please retry."}, status=status.HTTP_409_CONFLICT
+            )
+        # bulk_create/bulk_update bypass the membership signals
+        invalidate_memberships(set(existing) | set(desired))
+        project_snapshots.delete(project.pk)
+        return Response({"created": len(to_create), "updated": len(to_update), "deleted": len(to_delete)})
+
+    @action(detail=False, methods=["get"])
+    def timeline(self, request):
+        """Projects and tasks overlapping the `start`..`end` window, as columnar arrays.
+
+        Projects match when `start_date <= end` and `end_date >= start`, a missing
+        date counting as open-ended on that side; the `(start_date, end_date)` index
+        range-scans the dated part. Tasks match on `due_date` within the window.
+        """
+
+        params = TimelineQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start, end = params.validated_data["start"], params.validated_data["end"]
+
+        user: User = request.user
+        projects = Project.objects.filter(
+            models.Q(start_date__lte=end) | models.Q(start_date__isnull=True),
+            models.Q(end_date__gte=start) | models.Q(end_date__isnull=True),
+        )
+        tasks = Task.objects.filter(due_date__range=(start, end))
+        if user.role != User.Roles.ADMIN:
+            member_project_ids = ProjectMembership.objects.filter(user=user).values("project_id")
+            projects = projects.filter(models.Q(created_by=user) | models.Q(id__in=member_project_ids))
+            tasks = tasks.filter(models.Q(project_id__in=member_project_ids) | models.Q(created_by=user))
+
+        project_fields = ["id", "name", "status", "start_date", "end_date"]
+        task_fields = ["id", "project", "name", "status", "assignee", "due_date"]
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                "projects": columns(
+                    list(projects.order_by("start_date", "id").values_list(*project_fields)), project_fields
+                ),
+                "tasks": columns(list(tasks.order_by("due_date", "id").values_list(*task_fields)), task_fields),
+            }
+        )
+
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser, FormParser])
+    def import_file(self, request):
+        """Bulk-create projects from an uploaded CSV or NDJSON `file`."""
+
+        if request.user.role == User.Roles.VIEWER:
+            raise PermissionDenied("Viewers cannot import projects.")
+        return import_upload(ProjectImporter(request.user), request)
+
 
 class ProjectMembershipViewSet(viewsets.ModelViewSet):
     """Manage user assignments to projects (collaborators and viewers)."""
@@ -45,10 +237,9 @@ class ProjectMembershipViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user: User = self.request.user
+        qs = ProjectMembership.objects.filter(project__deleted_at__isnull=True).select_related("project", "user")
         if user.role == User.Roles.ADMIN:
-            return ProjectMembership.objects.select_related("project", "user")
+            return qs
         # Collaborators can manage memberships for projects they created or belong to
-        return ProjectMembership.objects.filter(
-            models.Q(project__created_by=user) | models.Q(project__members=user)
-        ).select_related("project", "user")
+        return qs.filter(models.Q(project__created_by=user) | models.Q(project__members=user))
 
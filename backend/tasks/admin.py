@@ -1,11 +1,15 @@
 from django.contrib import admin
 
+from core.paginator import EstimatedCountPaginator
 from .models import Comment, Task
 
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ("name", "project", "status", "assignee", "due_date", "created_by", "created_at")
+    list_select_related = ("project", "assignee", "created_by")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_filter = ("status", "due_date", "created_at")
     search_fields = ("name", "description")
     autocomplete_fields = ("project", "assignee", "created_by")
@@ -14,6 +18,9 @@ class TaskAdmin(admin.ModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ("task", "author", "created_at")
+    list_select_related = ("task", "author")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_filter = ("created_at",)
     search_fields = ("content", "task__name", "author__username")
     autocomplete_fields = ("task", "author")
@@ -0,0 +1,57 @@
+from typing import Dict, Optional
+
+from django.db import models
+from django.db.models.functions import RowNumber
+
+from core.pagination import decode_cursor, encode_cursor, seek_after
+from .models import Task
+
+# Card order within a column, served by the (project, status, rank) index; `id`
+# breaks ties so the ordering is unique and can drive keyset cursors
+BOARD_ORDERING = ("rank", "id")
+
+
+def _order_by():
+    return [
+        models.F(field[1:]).desc() if field.startswith("-") else models.F(field).asc() for field in BOARD_ORDERING
+    ]
+
+
+def board_columns(tasks: models.QuerySet, limit: int) -> Dict[str, Dict]:
+    """First `limit` cards and the total of every status column, in one query.
+
+    `ROW_NUMBER()` and `COUNT(*)` are both windowed over `PARTITION BY status`, and
+    the outer query keeps rows numbered up to `limit`.
+    """
+
+    rows = (
+        tasks.annotate(
+            position=models.Window(RowNumber(), partition_by=models.F("status"), order_by=_order_by()),
+            column_total=models.Window(models.Count("*"), partition_by=models.F("status")),
+        )
+        .filter(position__lte=limit)
+        .order_by("status", "position")
+    )
+    columns = {status: {"total": 0, "tasks": [], "next": None} for status in Task.Status.values}
+    for task in rows:
+        column = columns[task.status]
+        column["total"] = task.column_total
+        column["tasks"].append(task)
+    for column in columns.values():
+        if column["total"] > len(column["tasks"]):
+            column["next"] = encode_cursor(column["tasks"][-1], BOARD_ORDERING)
+    return columns
+
+
+def column_page(tasks: models.QuerySet, status: str, after: Optional[str], limit: int) -> Dict:
+    """The next `limit` cards of one column after the cursor from `board_columns`."""
+
+    column = tasks.filter(status=status)
+    if after:
+        column = column.filter(seek_after(BOARD_ORDERING, decode_cursor(Task, BOARD_ORDERING, after)))
+    rows = list(column.order_by(*BOARD_ORDERING)[: limit + 1])
+    page = rows[:limit]
+    return {
+        "tasks": page,
+        "next": encode_cursor(page[-1], BOARD_ORDERING) if len(rows) > limit else None,
+    }
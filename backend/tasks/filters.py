@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+import django_filters
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Task
+
+
+class TaskFilter(django_filters.FilterSet):
+    """Filters for the task list.
+
+    `due` narrows to open tasks by due date so that, combined with `assignee`, the
+    query is served by the `(assignee, status, due_date)` index.
+    """
+
+    DUE_CHOICES = (
+        ("overdue", "Overdue"),
+        ("today", "Due today"),
+        ("week", "Due within 7 days"),
+        ("soon", "Due soon (overdue or within DUE_SOON_DAYS)"),
+    )
+
+    due = django_filters.ChoiceFilter(choices=DUE_CHOICES, method="filter_due")
+
+    class Meta:
+        model = Task
+        fields = ["project", "status", "assignee", "due"]
+
+    def filter_due(self, queryset, name, value):
+        today = timezone.localdate()
+        queryset = queryset.filter(status__in=Task.OPEN_STATUSES)
+        if value == "overdue":
+            return queryset.filter(due_date__lt=today)
+        if value == "today":
+            return queryset.filter(due_date=today)
+        if value == "week":
+            return queryset.filter(due_date__range=(today, today + timedelta(days=6)))
+        return queryset.filter(due_date__lte=today + timedelta(days=settings.DUE_SOON_DAYS))
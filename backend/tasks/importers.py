@@ -0,0 +1,92 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Set
+
+from django.db import models
+from rest_framework import serializers
+
+from authentication.models import User
+from projects.importers import BulkImporter
+from projects.models import Project, ProjectMembership
+from .models import Task
+from .ranking import INLINE_REBALANCE_LENGTH, ranks_between, rebalance_column
+
+
+class TaskImportRowSerializer(serializers.Serializer):
+    """Scalar validation for an imported task row.
+
+    `project` and `assignee` are plain integers here; they are resolved per batch by
+    `TaskImporter.preload` instead of one `PrimaryKeyRelatedField` query per row.
+    """
+
+    project = serializers.IntegerField(min_value=1)
+    name = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+    status = serializers.ChoiceField(choices=Task.Status.choices, default=Task.Status.PENDING)
+    assignee = serializers.IntegerField(min_value=1, required=False, allow_null=True, default=None)
+    due_date = serializers.DateField(required=False, allow_null=True, default=None)
+
+
+class TaskImporter(BulkImporter):
+    """Import tasks into projects the importing user is allowed to write to."""
+
+    model = Task
+    row_serializer_class = TaskImportRowSerializer
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Lookups are kept across batches so each id is fetched at most once per import
+        self.writable_projects: Set[int] = set()
+        self.known_projects: Set[int] = set()
+        self.users: Set[int] = set()
+        self.known_users: Set[int] = set()
+
+    def preload(self, rows: List[Dict[str, Any]]) -> None:
+        project_ids = {row["project"] for row in rows} - self.known_projects
+        if project_ids:
+            qs = Project.objects.filter(id__in=project_ids)
+            if self.user.role != User.Roles.ADMIN:
+                collaborator_of = ProjectMembership.objects.filter(
+                    user=self.user, role=ProjectMembership.Role.COLLABORATOR
+                ).values("project_id")
+                qs = qs.filter(models.Q(created_by=self.user) | models.Q(id__in=collaborator_of))
+            self.writable_projects.update(qs.values_list("id", flat=True))
+            self.known_projects.update(project_ids)
+
+        user_ids = {row["assignee"] for row in rows if row["assignee"]} - self.known_users
+        if user_ids:
+            self.users.update(User.objects.filter(id__in=user_ids).values_list("id", flat=True))
+            self.known_users.update(user_ids)
+
+    def build(self, row: Dict[str, Any]) -> Task:
+        if row["project"] not in self.writable_projects:
+            raise serializers.ValidationError({"project": ["Project does not exist or is not writable."]})
+        if row["assignee"] and row["assignee"] not in self.users:
+            raise serializers.ValidationError({"assignee": ["User does not exist."]})
+        return Task(
+            project_id=row["project"],
+            assignee_id=row["assignee"],
+            name=row["name"],
+            description=row["description"],
+            status=row["status"],
+            due_date=row["due_date"],
+            created_by=self.user,
+        )
+
+    def prepare(self, objs: List[Task]) -> None:
+        # bulk_create skips Task.save, so rank the batch here: imported cards go to the
+        # top of their columns in file order, spread evenly to keep the keys short
+        columns: Dict[tuple, List[Task]] = defaultdict(list)
+        for task in objs:
+            columns[(task.project_id, task.status)].append(task)
+        tops = {
+            (row["project_id"], row["status"]): row["top"]
+            for row in Task.objects.filter(project_id__in={key[0] for key in columns})
+            .values("project_id", "status")
+            .annotate(top=models.Min("rank"))
+        }
+        for key, tasks in columns.items():
+            if len(tops.get(key) or "") >= INLINE_REBALANCE_LENGTH:
+                rebalance_column(*key)
+                tops[key] = Task.objects.filter(project_id=key[0], status=key[1]).aggregate(top=models.Min("rank"))["top"]
+            for task, rank in zip(tasks, ranks_between(None, tops.get(key) or None, len(tasks))):
+                task.rank = rank
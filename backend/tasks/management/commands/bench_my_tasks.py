@@ -0,0 +1,71 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the dedicated `my_tasks` endpoint with the generic task list filtered "
+        "by assignee: latency, queries per request and the plan of the main query."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="Username to authenticate as.")
+        parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+        settings.ROLE_THROTTLE_RATES = {"default": {}}
+        client = Client()
+
+        paths = (
+            ("generic ", f"/api/tasks/tasks/?assignee={user.pk}&ordering=status,due_date,id"),
+            ("my_tasks", "/api/tasks/tasks/my_tasks/"),
+        )
+        for label, path in paths:
+            client.get(path, headers=headers)  # warm up
+            queries = []
+
+            def capture(execute, sql, params, many, context):
+                # CaptureQueriesContext is reset by request_started, so record directly
+                started = time.perf_counter()
+                try:
+                    return execute(sql, params, many, context)
+                finally:
+                    queries.append((time.perf_counter() - started, sql, params))
+
+            with connection.execute_wrapper(capture):
+                response = client.get(path, headers=headers)
+            if response.status_code != 200:
+                raise CommandError(f"{path} returned {response.status_code}.")
+
+            latencies = []
+            for _ in range(options["requests"]):
+                started = time.perf_counter()
+                client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - started)
+            latencies.sort()
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            self.stdout.write(
+                f"{label} {path:<60} p50 {statistics.median(latencies) * 1000:7.2f} ms  "
+                f"p99 {p99 * 1000:7.2f} ms  queries {len(queries)}  rows {response.json()['count']}"
+            )
+            if options["verbosity"] > 1:
+                # The page query is the slowest one; show how the database runs it
+                _, sql, params = max(queries, key=lambda query: query[0])
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN {'QUERY PLAN ' if connection.vendor == 'sqlite' else ''}{sql}", params)
+                    for row in cursor.fetchall():
+                        self.stdout.write(f"    {row[-1]}")
@@ -0,0 +1,8 @@
+from projects.importers import BaseImportCommand
+from tasks.importers import TaskImporter
+
+
+class Command(BaseImportCommand):
+    help = "Bulk-import tasks from a CSV or NDJSON file, resolving projects and assignees per batch."
+
+    importer_class = TaskImporter
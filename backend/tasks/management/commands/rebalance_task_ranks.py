@@ -0,0 +1,37 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.models import Task
+from tasks.ranking import columns_needing_rebalance, rebalance_column
+
+
+class Command(BaseCommand):
+    help = "Respace board columns whose task ranks have grown long, keeping the card order."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-length", type=int, default=settings.TASK_RANK_REBALANCE_LENGTH)
+        parser.add_argument("--project", type=int, help="Rebalance every column of this project.")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running, checking for long ranks every this many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                if options["project"]:
+                    columns = [(options["project"], status) for status in Task.Status.values]
+                else:
+                    columns = list(columns_needing_rebalance(options["max_length"]))
+                for project_id, status in columns:
+                    changed = rebalance_column(project_id, status)
+                    self.stdout.write(f"project {project_id} / {status}: {changed} rank(s) rewritten")
+                if not options["interval"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Rank rebalancing done."))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.db.models.functions import Coalesce, Greatest
+
+from tasks.models import Comment, Task
+
+
+def comment_stats_updates():
+    """Update expressions recomputing `comment_count`/`last_activity_at` from comments."""
+
+    comments = Comment.objects.filter(task=models.OuterRef("pk")).order_by().values("task")
+    count = comments.annotate(total=models.Count("id")).values("total")
+    latest = comments.annotate(latest=models.Max("created_at")).values("latest")
+    return {
+        "comment_count": Coalesce(models.Subquery(count, output_field=models.IntegerField()), 0),
+        "last_activity_at": Greatest(
+            "updated_at",
+            Coalesce(models.Subquery(latest, output_field=models.DateTimeField()), "updated_at"),
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized Task.comment_count and Task.last_activity_at in id-range chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Tasks updated per statement.")
+
+    def handle(self, *args, **options):
+        bounds = Task.objects.aggregate(low=models.Min("id"), high=models.Max("id"))
+        if bounds["low"] is None:
+            self.stdout.write("No tasks to repair.")
+            return
+        updates = comment_stats_updates()
+        step = options["chunk_size"]
+        updated = 0
+        for start in range(bounds["low"], bounds["high"] + 1, step):
+            updated += Task.objects.filter(id__gte=start, id__lt=start + step).update(**updates)
+        self.stdout.write(self.style.SUCCESS(f"Recomputed comment stats for {updated} task(s)."))
@@ -0,0 +1,71 @@
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from notifications.models import Notification
+from tasks.models import Task
+
+MAX_LISTED_TASKS = 10
+
+
+class Command(BaseCommand):
+    help = (
+        "Create one digest notification per user listing their overdue and due-soon open tasks. "
+        "Intended to run once a day from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.DUE_SOON_DAYS, help="Due-soon horizon in days.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Notifications per bulk insert.")
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be sent without writing.")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        horizon = today + timedelta(days=options["days"])
+        batch_size = options["batch_size"]
+
+        # Single ordered scan over the (assignee, status, due_date) index
+        rows = (
+            Task.objects.filter(
+                assignee__isnull=False,
+                status__in=Task.OPEN_STATUSES,
+                due_date__lte=horizon,
+            )
+            .order_by("assignee_id", "status", "due_date")
+            .values_list("assignee_id", "name", "due_date")
+            .iterator(chunk_size=2000)
+        )
+
+        pending, users, sent = [], 0, 0
+        for assignee_id, tasks in groupby(rows, key=lambda row: row[0]):
+            tasks = sorted(tasks, key=lambda row: row[2])
+            overdue = sum(1 for _, _, due in tasks if due < today)
+            lines = [
+                f"- {name} ({'overdue since' if due < today else 'due'} {due.isoformat()})"
+                for _, name, due in tasks[:MAX_LISTED_TASKS]
+            ]
+            if len(tasks) > MAX_LISTED_TASKS:
+                lines.append(f"... and {len(tasks) - MAX_LISTED_TASKS} more")
+            pending.append(
+                Notification(
+                    user_id=assignee_id,
+                    title=f"{len(tasks)} open task(s) due by {horizon.isoformat()} ({overdue} overdue)",
+                    message="\n".join(lines),
+                )
+            )
+            users += 1
+            if len(pending) >= batch_size:
+                sent += self._flush(pending, options["dry_run"])
+                pending = []
+        sent += self._flush(pending, options["dry_run"])
+
+        verb = "Would send" if options["dry_run"] else "Sent"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {sent} digest(s) to {users} user(s)."))
+
+    def _flush(self, notifications, dry_run: bool) -> int:
+        if notifications and not dry_run:
+            Notification.objects.bulk_create(notifications)
+        return len(notifications)
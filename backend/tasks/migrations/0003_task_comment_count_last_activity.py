@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:24
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_comment_stats(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    Comment = apps.get_model("tasks", "Comment")
+    comments = Comment.objects.filter(task=models.OuterRef("pk")).order_by().values("task")
+    count = comments.annotate(total=models.Count("id")).values("total")
+    latest = comments.annotate(latest=models.Max("created_at")).values("latest")
+    Task.objects.update(
+        comment_count=Coalesce(models.Subquery(count, output_field=models.IntegerField()), 0),
+        last_activity_at=Greatest(
+            "updated_at",
+            Coalesce(models.Subquery(latest, output_field=models.DateTimeField()), "updated_at"),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_task_assignee_status_due_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='last_activity_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['last_activity_at'], name='tasks_task_last_ac_753e34_idx'),
+        ),
+        migrations.RunPython(backfill_comment_stats, migrations.RunPython.noop),
+    ]
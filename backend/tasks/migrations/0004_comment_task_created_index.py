@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_comment_count_last_activity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', 'created_at'], name='tasks_comme_task_id_860403_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:42
+
+import math
+
+from django.db import migrations, models
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def spread_ranks(count):
+    # Frozen copy of tasks.ranking.spread_ranks as of this migration, so later
+    # changes to the live ranking code cannot alter the backfill
+    base = len(DIGITS)
+    width = max(1, math.ceil(math.log(count + 1, base)))
+    step = base**width // (count + 1)
+    ranks = []
+    for i in range(1, count + 1):
+        value, digits = i * step, []
+        for _ in range(width):
+            value, digit = divmod(value, base)
+            digits.append(DIGITS[digit])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+
+
+def backfill_ranks(apps, schema_editor):
+    # Keep the previous newest-first order within every board column
+    Task = apps.get_model("tasks", "Task")
+    columns = Task.objects.values_list("project_id", "status").order_by().distinct()
+    for project_id, status in columns:
+        tasks = list(
+            Task.objects.filter(project_id=project_id, status=status).order_by("-created_at", "-id").only("id")
+        )
+        for task, rank in zip(tasks, spread_ranks(len(tasks))):
+            task.rank = rank
+        Task.objects.bulk_update(tasks, ["rank"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_comment_task_created_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_project_b78682_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_ranks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'rank'], name='tasks_task_project_0c659a_idx'),
+        ),
+    ]
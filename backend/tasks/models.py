@@ -1,9 +1,13 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
+from core.models import DELETED, LIVE, SoftDeleteModel
+from core.snapshots import task_snapshots
 from projects.models import Project
+from .ranking import top_rank
 
 
-class Task(models.Model):
+class Task(SoftDeleteModel):
     """Task within a project.
 
     Only admins and collaborators can create/edit tasks. Viewers can read tasks of
@@ -15,6 +19,9 @@ class Task(models.Model):
         IN_PROGRESS = "in_progress", "In Progress"
         COMPLETED = "completed", "Completed"
 
+    # Statuses that still count as outstanding work (due filters, digests)
+    OPEN_STATUSES = (Status.PENDING, Status.IN_PROGRESS)
+
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="tasks")
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -36,16 +43,76 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized from comments; kept in sync by Comment.save/delete with F() updates
+    # and repairable with `manage.py recount_task_comments`.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Maintained only through F() updates, never written back by an ordinary save
+    COUNTER_FIELDS = ("comment_count",)
+
+    # Position within the project's board column (see tasks.ranking); lower is higher up
+    rank = models.CharField(max_length=255, blank=True, default="", editable=False)
+
     class Meta:
         indexes = [
-            models.Index(fields=["project", "status"]),
+            models.Index(fields=["project", "status", "rank"], condition=LIVE, name="task_board_live_idx"),
             models.Index(fields=["due_date"]),
+            # Serves "my tasks" (see TaskViewSet.my_tasks), due filters and workload counts
+            models.Index(
+                fields=["assignee", "status", "due_date", "id"], condition=LIVE, name="task_assignee_live_idx"
+            ),
+            models.Index(fields=["last_activity_at"]),
+            models.Index(fields=["deleted_at"], condition=DELETED, name="task_deleted_idx"),
         ]
         ordering = ["-created_at"]
 
     def __str__(self) -> str:
         return f"{self.name} [{self.status}]"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_position = instance._position()
+        return instance
+
+    def _position(self):
+        return self.__dict__.get("project_id"), self.__dict__.get("status"), self.__dict__.get("rank")
+
+    def _changed_column(self, update_fields) -> bool:
+        """True if this save moves the task to another column without giving it a rank there."""
+
+        loaded = getattr(self, "_loaded_position", None)
+        if loaded is None or None in loaded:
+            return False
+        if update_fields is not None and ("rank" in update_fields or not {"project", "status"} & set(update_fields)):
+            return False
+        return (self.project_id, self.status) != loaded[:2] and self.rank == loaded[2]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.rank:
+            # New cards go to the top of their column
+            self.rank = top_rank(self.project_id, self.status)
+        elif self._changed_column(kwargs.get("update_fields")):
+            # e.g. a PATCH of `status`: the old column's rank means nothing in the new one
+            self.rank = top_rank(self.project_id, self.status)
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "rank"}
+        self.last_activity_at = timezone.now()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "last_activity_at"}
+        elif not self._state.adding and not kwargs.get("force_insert"):
+            # A full save of a loaded task would overwrite counters that comments
+            # have bumped since it was read, so write every other field instead
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+        self._loaded_position = self._position()
+
 
 class Comment(models.Model):
     """Comment on a task by a user."""
@@ -57,7 +124,28 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [models.Index(fields=["task", "created_at"])]
 
     def __str__(self) -> str:
         return f"Comment by {self.author} on {self.task}"
 
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if created:
+                Task.objects.filter(pk=self.task_id).update(
+                    comment_count=models.F("comment_count") + 1,
+                    last_activity_at=self.created_at,
+                )
+                transaction.on_commit(lambda: task_snapshots.delete(self.task_id))
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Task.objects.filter(pk=self.task_id, comment_count__gt=0).update(
+                comment_count=models.F("comment_count") - 1
+            )
+            transaction.on_commit(lambda: task_snapshots.delete(self.task_id))
+        return result
+
@@ -0,0 +1,154 @@
+"""Lexicographic fractional indexing for `Task.rank`.
+
+Ranks are strings over `0-9a-z` compared byte-wise, read as base-36 fractions
+(`"h"` is 17/36, `"h8"` is 17/36 + 8/36²). A key never ends in `"0"`, so there is
+always room for another key between any two, and moving a card only rewrites
+that card's rank. Keys get longer as a spot is subdivided repeatedly;
+`rebalance_column` (run by `manage.py rebalance_task_ranks`, and inline by
+`top_rank` once a column's top key nears `MAX_LENGTH`) respaces a column with
+short keys.
+"""
+
+import math
+from typing import List, Optional
+
+from django.db import models, transaction
+
+from core.snapshots import task_snapshots
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+# Task.rank's max_length
+MAX_LENGTH = 255
+# Placing a card above a top key this long respaces the column first
+INLINE_REBALANCE_LENGTH = 128
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """A key strictly between `before` and `after` (`None` meaning the column edge).
+
+    Raises `ValueError` if the neighbours are out of order or the key would not fit
+    in `MAX_LENGTH`; rebalancing the column fixes both.
+    """
+
+    before = before or ""
+    if after is not None and after <= before:
+        raise ValueError(f"Ranks out of order: {before!r} >= {after!r}")
+    rank = _midpoint(before, after)
+    if len(rank) > MAX_LENGTH:
+        raise ValueError("Rank too long; the column needs rebalancing.")
+    return rank
+
+
+def rank_before(after: Optional[str]) -> str:
+    """A key just below `after`, for putting a card at the top of a column.
+
+    Steps the last digit down instead of halving the gap to the edge, so repeated
+    prepends add a digit only every `BASE - 1` cards rather than every few.
+    """
+
+    if not after:
+        return DIGITS[BASE // 2]
+    last = DIGITS.index(after[-1])
+    rank = after[:-1] + (DIGITS[last - 1] if last > 1 else "0" + DIGITS[-1])
+    if len(rank) > MAX_LENGTH:
+        raise ValueError("Rank too long; the column needs rebalancing.")
+    return rank
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    if high is not None:
+        # Copy the shared prefix (treating a missing digit of `low` as "0")
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else "0") == high[n]:
+            n += 1
+        if n:
+            return high[:n] + _midpoint(low[n:], high[n:])
+    digit_low = DIGITS.index(low[0]) if low else 0
+    digit_high = DIGITS.index(high[0]) if high is not None else BASE
+    if digit_high - digit_low > 1:
+        return DIGITS[(digit_low + digit_high) // 2]
+    # Adjacent first digits: a longer `high` already sorts above its first digit,
+    # otherwise keep `low`'s digit and look for room further right
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[digit_low] + _midpoint(low[1:], None)
+
+
+def ranks_between(before: Optional[str], after: Optional[str], count: int) -> List[str]:
+    """`count` ascending keys between `before` and `after`, split evenly so they stay short."""
+
+    if count <= 0:
+        return []
+    middle = rank_between(before, after)
+    left = (count - 1) // 2
+    return ranks_between(before, middle, left) + [middle] + ranks_between(middle, after, count - 1 - left)
+
+
+def spread_ranks(count: int) -> List[str]:
+    """`count` evenly spaced keys of the shortest sufficient width."""
+
+    width = max(1, math.ceil(math.log(count + 1, BASE)))
+    step = BASE**width // (count + 1)
+    ranks = []
+    for i in range(1, count + 1):
+        value, digits = i * step, []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+
+
+def rebalance_column(project_id: int, status: str) -> int:
+    """Respace the ranks of one board column, keeping its order. Returns rows changed."""
+
+    from .models import Task
+
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(project_id=project_id, status=status)
+            .order_by("rank", "id")
+            .only("id", "rank")
+        )
+        changed = []
+        for task, rank in zip(tasks, spread_ranks(len(tasks))):
+            if task.rank != rank:
+                task.rank = rank
+                changed.append(task)
+        Task.objects.bulk_update(changed, ["rank"], batch_size=1000)
+        # bulk_update sends no signals; cached task payloads include the rank
+        ids = [task.pk for task in changed]
+        transaction.on_commit(lambda: task_snapshots.delete_many(ids))
+    return len(changed)
+
+
+def top_rank(project_id: int, status: str) -> str:
+    """Rank for a card placed at the top of a column, respacing the column first if
+    its top key has grown past `INLINE_REBALANCE_LENGTH`."""
+
+    from .models import Task
+
+    column = Task.objects.filter(project_id=project_id, status=status).order_by("rank").values_list("rank", flat=True)
+    top = column.first()
+    if top and len(top) >= INLINE_REBALANCE_LENGTH:
+        rebalance_column(project_id, status)
+        top = column.first()
+    return rank_before(top)
+
+
+def columns_needing_rebalance(max_length: int) -> models.QuerySet:
+    """`(project_id, status)` pairs holding a rank longer than `max_length`."""
+
+    from django.db.models.functions import Length
+
+    from .models import Task
+
+    return (
+        Task.objects.annotate(rank_length=Length("rank"))
+        .filter(rank_length__gt=max_length)
+        .values_list("project_id", "status")
+        .order_by()
+        .distinct()
+    )
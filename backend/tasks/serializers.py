@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 
 from authentication.models import User
@@ -14,6 +15,13 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "author", "created_at"]
 
 
+class TaskCommentSerializer(CommentSerializer):
+    """Comment payload for the nested `tasks/{id}/comments/` action, where the task comes from the URL."""
+
+    class Meta(CommentSerializer.Meta):
+        read_only_fields = ["id", "task", "author", "created_at"]
+
+
 class TaskSerializer(serializers.ModelSerializer):
     created_by = serializers.PrimaryKeyRelatedField(read_only=True)
     assignee = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), allow_null=True, required=False)
@@ -32,5 +40,61 @@ class TaskSerializer(serializers.ModelSerializer):
             "created_by",
             "created_at",
             "updated_at",
+            "comment_count",
+            "last_activity_at",
+            "rank",
         ]
-        read_only_fields = ["id", "created_by", "created_at", "updated_at"]
+        read_only_fields = [
+            "id",
+            "created_by",
+            "created_at",
+            "updated_at",
+            "comment_count",
+            "last_activity_at",
+            "rank",
+        ]
+
+
+class BoardQuerySerializer(serializers.Serializer):
+    """Query parameters of the board endpoint.
+
+    Without `status` the whole board is returned; with `status` (and the `next`
+    cursor of that column as `after`) only the following page of that column.
+    """
+
+    project = serializers.IntegerField(min_value=1)
+    limit = serializers.IntegerField(min_value=1, required=False)
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    after = serializers.CharField(required=False)
+
+    def validate_limit(self, value):
+        return min(value, settings.BOARD_MAX_COLUMN_SIZE)
+
+    def validate(self, attrs):
+        if "after" in attrs and "status" not in attrs:
+            raise serializers.ValidationError({"after": "A cursor needs the column's `status`."})
+        attrs.setdefault("limit", settings.BOARD_COLUMN_SIZE)
+        return attrs
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """Drag-and-drop target: an optional new `status` column and the card to drop the
+    task right after (below) or before (above). Neither puts it at the top."""
+
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    after = serializers.IntegerField(min_value=1, required=False)
+    before = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if "after" in attrs and "before" in attrs:
+            raise serializers.ValidationError("Give either `after` or `before`, not both.")
+        return attrs
+
+
+class WorkloadQuerySerializer(serializers.Serializer):
+    project = serializers.IntegerField(min_value=1, required=False)
+    per_project = serializers.BooleanField(default=False)
+
+
+class MyTasksQuerySerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
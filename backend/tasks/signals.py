@@ -0,0 +1,29 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.snapshots import task_snapshots
+from .models import Task
+from .snapshots import store_task_snapshot
+
+
+@receiver(post_save, sender=Task)
+def refresh_task_snapshot(sender, instance: Task, raw=False, **kwargs):
+    if raw:
+        return
+
+    def refresh():
+        # Saves leave `comment_count` out of their UPDATE, so the instance may be stale;
+        # snapshot the committed row instead
+        task = Task.objects.filter(pk=instance.pk).first()
+        if task is None:
+            task_snapshots.delete(instance.pk)
+        else:
+            store_task_snapshot(task)
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_delete, sender=Task)
+def drop_task_snapshot(sender, instance: Task, **kwargs):
+    transaction.on_commit(lambda: task_snapshots.delete(instance.pk))
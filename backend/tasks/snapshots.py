@@ -0,0 +1,13 @@
+from core.snapshots import task_snapshots
+from .serializers import TaskSerializer
+
+
+def store_task_snapshot(task, data=None) -> None:
+    if data is None:
+        data = TaskSerializer(task).data
+    task_snapshots.set(
+        task.pk,
+        task.updated_at.isoformat(),
+        dict(data),
+        {"project_id": task.project_id, "created_by_id": task.created_by_id},
+    )
@@ -1,3 +1,475 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from core.idempotency import cache_key
+from core.snapshots import task_snapshots
+from core.testing import AdminQueryBudgetMixin
+from projects.models import Project, ProjectMembership
+from .models import Comment, Task
+from .ranking import MAX_LENGTH, rank_before, rank_between, ranks_between, rebalance_column, spread_ranks
+
+
+class TaskAdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+    """Changelist query counts must not grow with the number of rows on the page."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = cls.create_admin_user()
+        users = User.objects.bulk_create([User(username=f"user{i}") for i in range(30)])
+        projects = Project.objects.bulk_create(
+            [Project(name=f"Project {i}", created_by=user) for i, user in enumerate(users)]
+        )
+        tasks = Task.objects.bulk_create(
+            [
+                Task(project=project, name=f"Task {i}", assignee=user, created_by=user)
+                for i, (project, user) in enumerate(zip(projects, users))
+            ]
+        )
+        Comment.objects.bulk_create([Comment(task=task, author=task.assignee, content="hi") for task in tasks])
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_task_changelist(self):
+        self.assertChangelistWithinBudget(reverse("admin:tasks_task_changelist"), 6)
+
+    def test_comment_changelist(self):
+        self.assertChangelistWithinBudget(reverse("admin:tasks_comment_changelist"), 6)
+
+
+class TaskCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass1234")
+        cls.project = Project.objects.create(name="Project", created_by=cls.user)
+
+    def test_saving_a_stale_task_keeps_the_comment_count(self):
+        task = Task.objects.create(project=self.project, name="Task", created_by=self.user)
+        stale = Task.objects.get(pk=task.pk)
+        for _ in range(3):
+            Comment.objects.create(task=task, author=self.user, content="hi")
+
+        stale.name = "Renamed"
+        stale.save()
+
+        task.refresh_from_db()
+        self.assertEqual(task.name, "Renamed")
+        self.assertEqual(task.comment_count, 3)
+
+
+class TaskIdempotencyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.other = User.objects.create_user(username="other", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.project = Project.objects.create(name="Project", created_by=cls.owner)
+        ProjectMembership.objects.create(
+            project=cls.project, user=cls.other, role=ProjectMembership.Role.COLLABORATOR
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def create(self, key, name="Write docs", client=None):
+        return (client or self.client).post(
+            reverse("task-list"), {"project": self.project.pk, "name": name}, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.create("create-1")
+        with self.assertNumQueries(0):
+            retry = self.create("create-1")
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.data["id"], first.data["id"])
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_key_reused_with_another_body_is_rejected(self):
+        self.create("create-1")
+        self.assertEqual(self.create("create-1", name="Something else").status_code, 422)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_duplicate_while_in_progress_conflicts(self):
+        cache.add(cache_key(f"user:{self.owner.pk}", "POST", reverse("task-list"), "create-1") + ":lock", True)
+        response = self.create("create-1")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(Task.objects.exists())
+
+    def test_keys_are_scoped_per_user(self):
+        other_client = APIClient()
+        other_client.force_authenticate(self.other)
+        first = self.create("create-1")
+        second = self.create("create-1", client=other_client)
+        self.assertEqual(second.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", second)
+        self.assertNotEqual(first.data["id"], second.data["id"])
+
+    def test_comment_retry_adds_one_comment(self):
+        task = Task.objects.create(project=self.project, name="Task", created_by=self.owner)
+        url = reverse("task-comments", args=[task.pk])
+        for _ in range(2):
+            response = self.client.post(url, {"content": "hi"}, format="json", HTTP_IDEMPOTENCY_KEY="comment-1")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(task.comments.count(), 1)
+
+
+class RebalanceTests(TestCase):
+    def test_rebalancing_drops_cached_payloads_of_moved_tasks(self):
+        user = User.objects.create_user(username="owner", password="pass1234")
+        project = Project.objects.create(name="Project", created_by=user)
+        tasks = [Task.objects.create(project=project, name=f"Task {i}", created_by=user) for i in range(3)]
+        Task.objects.filter(pk=tasks[0].pk).update(rank="0000001")
+        cache.clear()
+        for task in tasks:
+            task_snapshots.set(task.pk, "v", {"id": task.pk}, {"project_id": project.pk, "created_by_id": user.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            changed = rebalance_column(project.pk, Task.Status.PENDING)
+
+        self.assertEqual(changed, 3)
+        self.assertEqual([task_snapshots.get(task.pk) for task in tasks], [None, None, None])
+
+
+class RankKeyTests(SimpleTestCase):
+    def test_rank_between_orders_keys(self):
+        cases = [(None, None), (None, "i"), ("i", None), ("h", "i"), ("h", "h1"), ("h8", "i"), ("0z", "1"), ("a", "a01")]
+        for before, after in cases:
+            with self.subTest(before=before, after=after):
+                rank = rank_between(before, after)
+                self.assertGreater(rank, before or "")
+                if after is not None:
+                    self.assertLess(rank, after)
+                self.assertFalse(rank.endswith("0"))
+
+    def test_rank_between_rejects_out_of_order_neighbours(self):
+        with self.assertRaises(ValueError):
+            rank_between("m", "m")
+        with self.assertRaises(ValueError):
+            rank_between("n", "m")
+
+    def test_rank_between_refuses_keys_longer_than_the_column(self):
+        with self.assertRaises(ValueError):
+            rank_between("h" * MAX_LENGTH, "h" * MAX_LENGTH + "1")
+
+    def test_repeated_inserts_between_neighbours_stay_ordered(self):
+        low, high = "h", "i"
+        for _ in range(50):
+            middle = rank_between(low, high)
+            self.assertTrue(low < middle < high)
+            high = middle
+
+    def test_ranks_between_is_sorted_and_short(self):
+        ranks = ranks_between("a", "b", 100)
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual(len(set(ranks)), 100)
+        self.assertTrue(all("a" < rank < "b" for rank in ranks))
+        self.assertLessEqual(max(map(len, ranks)), 3)
+        self.assertEqual(ranks_between(None, None, 0), [])
+
+    def test_spread_ranks_are_sorted_unique_and_minimal(self):
+        for count in (1, 10, 35, 36, 1000):
+            with self.subTest(count=count):
+                ranks = spread_ranks(count)
+                self.assertEqual(len(ranks), count)
+                self.assertEqual(ranks, sorted(set(ranks)))
+                self.assertTrue(all(rank and not rank.endswith("0") for rank in ranks))
+        self.assertEqual(max(map(len, spread_ranks(35))), 1)
+
+    def test_prepending_grows_keys_slowly(self):
+        top, ranks = None, []
+        for _ in range(2000):
+            top = rank_before(top)
+            ranks.append(top)
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+        self.assertLessEqual(len(top), 2000 // 35 + 1)
+
+
+class TaskMoveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.project = Project.objects.create(name="Project", created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Created in reverse so the column reads a, b, c from the top
+        self.c, self.b, self.a = [
+            Task.objects.create(project=self.project, name=name, created_by=self.user) for name in "cba"
+        ]
+
+    def column(self, status=Task.Status.PENDING):
+        return list(
+            Task.objects.filter(project=self.project, status=status).order_by("rank", "id").values_list("name", flat=True)
+        )
+
+    def move(self, task, **data):
+        return self.client.post(reverse("task-move", args=[task.pk]), data, format="json")
+
+    def test_new_tasks_go_to_the_top(self):
+        self.assertEqual(self.column(), ["a", "b", "c"])
+
+    def test_move_after_and_before(self):
+        self.assertEqual(self.move(self.a, after=self.b.pk).status_code, 200)
+        self.assertEqual(self.column(), ["b", "a", "c"])
+        self.assertEqual(self.move(self.c, before=self.b.pk).status_code, 200)
+        self.assertEqual(self.column(), ["c", "b", "a"])
+
+    def test_move_to_the_top_of_another_column(self):
+        Task.objects.create(project=self.project, name="d", status=Task.Status.COMPLETED, created_by=self.user)
+        response = self.move(self.b, status=Task.Status.COMPLETED)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column(), ["a", "c"])
+        self.assertEqual(self.column(Task.Status.COMPLETED), ["b", "d"])
+
+    def test_move_after_a_card_of_another_column_is_rejected(self):
+        other = Task.objects.create(project=self.project, name="x", status=Task.Status.COMPLETED, created_by=self.user)
+        self.assertEqual(self.move(self.a, after=other.pk).status_code, 400)
+
+    def test_move_into_a_full_column_rebalances_inline(self):
+        Task.objects.filter(pk=self.b.pk).update(rank="h" * MAX_LENGTH)
+        Task.objects.filter(pk=self.c.pk).update(rank="h" * MAX_LENGTH + "1")
+        response = self.move(self.a, after=self.b.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column(), ["b", "a", "c"])
+        self.assertLess(max(len(rank) for rank in Task.objects.values_list("rank", flat=True)), 5)
+
+    def test_creating_above_a_long_top_key_rebalances_the_column(self):
+        Task.objects.filter(pk=self.a.pk).update(rank="0" * 200 + "1")
+        Task.objects.create(project=self.project, name="new", created_by=self.user)
+        self.assertEqual(self.column(), ["new", "a", "b", "c"])
+        self.assertLess(max(len(rank) for rank in Task.objects.values_list("rank", flat=True)), 5)
+
+    def test_patching_status_ranks_the_task_in_its_new_column(self):
+        done = Task.objects.create(project=self.project, name="d", status=Task.Status.COMPLETED, created_by=self.user)
+        response = self.client.patch(
+            reverse("task-detail", args=[self.c.pk]), {"status": Task.Status.COMPLETED}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.column(Task.Status.COMPLETED), ["c", "d"])
+        self.assertLess(Task.objects.get(pk=self.c.pk).rank, done.rank)
+
+
+class TaskBoardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.outsider = User.objects.create_user(username="outsider", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.project = Project.objects.create(name="Project", created_by=cls.owner)
+        ProjectMembership.objects.create(project=cls.project, user=cls.owner, role=ProjectMembership.Role.COLLABORATOR)
+        # New tasks go on top of their column, so each column reads newest first
+        cls.pending = [
+            Task.objects.create(project=cls.project, name=f"P{i}", created_by=cls.owner) for i in range(5)
+        ][::-1]
+        cls.in_progress = [
+            Task.objects.create(project=cls.project, name=f"I{i}", status=Task.Status.IN_PROGRESS, created_by=cls.owner)
+            for i in range(2)
+        ][::-1]
+        cls.own = Task.objects.create(project=cls.project, name="Own", created_by=cls.outsider)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def board(self, **params):
+        response = self.client.get(reverse("task-board"), {"project": self.project.pk, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_columns_carry_totals_and_their_first_cards(self):
+        columns = self.board(limit=2)["columns"]
+        totals = {status: column["total"] for status, column in columns.items()}
+        self.assertEqual(totals, {Task.Status.PENDING: 6, Task.Status.IN_PROGRESS: 2, Task.Status.COMPLETED: 0})
+        self.assertEqual(
+            [task["id"] for task in columns[Task.Status.PENDING]["tasks"]], [self.own.pk, self.pending[0].pk]
+        )
+        self.assertIsNotNone(columns[Task.Status.PENDING]["next"])
+        self.assertEqual(
+            [task["id"] for task in columns[Task.Status.IN_PROGRESS]["tasks"]], [t.pk for t in self.in_progress]
+        )
+        self.assertIsNone(columns[Task.Status.IN_PROGRESS]["next"])
+        self.assertEqual(columns[Task.Status.COMPLETED], {"total": 0, "tasks": [], "next": None})
+
+    def test_column_cursors_continue_where_the_board_stopped(self):
+        cursor = self.board(limit=2)["columns"][Task.Status.PENDING]["next"]
+        seen = []
+        while cursor:
+            page = self.board(status=Task.Status.PENDING, after=cursor, limit=2)
+            seen.extend(task["id"] for task in page["tasks"])
+            cursor = page["next"]
+        self.assertEqual(seen, [t.pk for t in self.pending[1:]])
+
+    def test_non_members_only_see_their_own_cards(self):
+        self.client.force_authenticate(self.outsider)
+        columns = self.board()["columns"]
+        self.assertEqual(columns[Task.Status.PENDING]["total"], 1)
+        self.assertEqual([task["id"] for task in columns[Task.Status.PENDING]["tasks"]], [self.own.pk])
+        self.assertEqual(columns[Task.Status.IN_PROGRESS]["total"], 0)
+
+    def test_cursor_needs_a_status(self):
+        cursor = self.board(limit=1)["columns"][Task.Status.PENDING]["next"]
+        response = self.client.get(reverse("task-board"), {"project": self.project.pk, "after": cursor})
+        self.assertEqual(response.status_code, 400)
+
+
+class CommentThreadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        project = Project.objects.create(name="Project", created_by=cls.user)
+        cls.task = Task.objects.create(project=project, name="Task", created_by=cls.user)
+        comments = Comment.objects.bulk_create(
+            [Comment(task=cls.task, author=cls.user, content=str(i)) for i in range(7)]
+        )
+        # Ties on created_at are broken by id
+        Comment.objects.filter(pk__in=[c.pk for c in comments[2:5]]).update(created_at=comments[2].created_at)
+        cls.ids = [c.pk for c in comments]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def page(self, **params):
+        response = self.client.get(reverse("task-comments", args=[self.task.pk]), {"limit": 3, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data, [comment["id"] for comment in response.data["results"]]
+
+    def test_before_cursors_walk_back_to_the_first_comment(self):
+        data, ids = self.page()
+        self.assertEqual(ids, self.ids[4:])
+        self.assertIsNone(data["after"])
+        data, ids = self.page(before=data["before"])
+        self.assertEqual(ids, self.ids[1:4])
+        data, ids = self.page(before=data["before"])
+        self.assertEqual(ids, self.ids[:1])
+        self.assertIsNone(data["before"])
+
+        data, ids = self.page(after=data["after"])
+        self.assertEqual(ids, self.ids[1:4])
+        self.assertIsNotNone(data["after"])
+
+    def test_invalid_cursors_are_rejected(self):
+        url = reverse("task-comments", args=[self.task.pk])
+        self.assertEqual(self.client.get(url, {"before": "not-a-cursor"}).status_code, 400)
+        data, _ = self.page()
+        self.assertEqual(self.client.get(url, {"before": data["before"], "after": data["before"]}).status_code, 400)
+
+
+class TaskSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.member = User.objects.create_user(username="member", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.project = Project.objects.create(name="Project", created_by=cls.owner)
+        cls.membership = ProjectMembership.objects.create(
+            project=cls.project, user=cls.member, role=ProjectMembership.Role.COLLABORATOR
+        )
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task = Task.objects.create(project=self.project, name="Task", created_by=self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+        self.url = reverse("task-detail", args=[self.task.pk])
+
+    def test_hot_reads_do_not_query(self):
+        self.assertEqual(self.client.get(self.url).data["name"], "Task")
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["name"], "Task")
+
+    def test_update_refreshes_the_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.url, {"name": "Renamed"}, format="json")
+        self.assertEqual(task_snapshots.get(self.task.pk)["data"]["name"], "Renamed")
+        self.assertEqual(self.client.get(self.url).data["name"], "Renamed")
+
+    def test_delete_drops_the_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(self.url).status_code, 204)
+        self.assertIsNone(task_snapshots.get(self.task.pk))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_new_comment_drops_the_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(task=self.task, author=self.member, content="hi")
+        self.assertIsNone(task_snapshots.get(self.task.pk))
+        self.assertEqual(self.client.get(self.url).data["comment_count"], 1)
+
+    def test_saving_a_stale_instance_keeps_the_comment_count(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(task=self.task, author=self.member, content="hi")
+        with self.captureOnCommitCallbacks(execute=True):
+            stale.name = "Renamed"
+            stale.save()
+        snapshot = task_snapshots.get(self.task.pk)["data"]
+        self.assertEqual((snapshot["name"], snapshot["comment_count"]), ("Renamed", 1))
+        self.assertEqual(self.client.get(self.url).data["comment_count"], 1)
+
+    def test_removed_members_lose_access_to_cached_snapshots(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.membership.delete()
+        self.assertIsNotNone(task_snapshots.get(self.task.pk))
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=self.member.pk))
+        self.assertEqual(client.get(self.url).status_code, 404)
+
+
+class TaskSoftDeleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username="owner", password="pass1234", role=User.Roles.COLLABORATOR)
+        cls.project = Project.objects.create(name="Project", created_by=cls.owner)
+        cls.kept, cls.deleted = (
+            Task.objects.create(project=cls.project, name=name, created_by=cls.owner) for name in ("Kept", "Deleted")
+        )
+        for task in (cls.kept, cls.deleted):
+            Comment.objects.create(task=task, author=cls.owner, content="hi")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.delete(reverse("task-detail", args=[self.deleted.pk]))
+
+    def test_deleted_task_and_its_comments_are_hidden(self):
+        self.assertEqual(self.delete().status_code, 204)
+        self.assertEqual(self.client.get(reverse("task-detail", args=[self.deleted.pk])).status_code, 404)
+        tasks = self.client.get(reverse("task-list")).data["results"]
+        self.assertEqual([task["id"] for task in tasks], [self.kept.pk])
+        comments = self.client.get(reverse("comment-list")).data["results"]
+        self.assertEqual([comment["task"] for comment in comments], [self.kept.pk])
+        self.assertIsNotNone(Task.all_objects.get(pk=self.deleted.pk).deleted_at)
+
+    def test_purge_waits_for_the_retention_period(self):
+        self.delete()
+        call_command("purge_deleted", days=7, stdout=StringIO())
+        self.assertTrue(Task.all_objects.filter(pk=self.deleted.pk).exists())
+
+        Task.all_objects.filter(pk=self.deleted.pk).update(deleted_at=timezone.now() - timedelta(days=8))
+        call_command("purge_deleted", days=7, stdout=StringIO())
+        self.assertFalse(Task.all_objects.filter(pk=self.deleted.pk).exists())
+        self.assertFalse(Comment.objects.filter(task_id=self.deleted.pk).exists())
+        self.assertEqual(list(Task.objects.values_list("pk", flat=True)), [self.kept.pk])
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
@@ -1,20 +1,58 @@
-from django.db import models
-from rest_framework import permissions, viewsets
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.utils import timezone
+from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 
+from activity.log import record_created, record_updated, tracked_values
+from activity.views import ActivityHistoryMixin
 from authentication.models import User
+from core.idempotency import idempotent
+from core.metrics import record_cache
+from core.pagination import KeysetPagination
+from core.snapshots import SnapshotRetrieveMixin, task_snapshots
+from notifications.outbox import record_comment, record_task_change
+from projects.importers import import_upload
 from projects.models import ProjectMembership
+from projects.access import membership_roles
+from .board import BOARD_ORDERING, board_columns, column_page
+from .filters import TaskFilter
+from .importers import TaskImporter
 from .models import Comment, Task
 from .permissions import IsAdminOrProjectCollaborator
-from .serializers import CommentSerializer, TaskSerializer
+from .ranking import rank_before, rank_between, rebalance_column
+from .serializers import (
+    BoardQuerySerializer,
+    CommentSerializer,
+    MyTasksQuerySerializer,
+    TaskCommentSerializer,
+    TaskMoveSerializer,
+    TaskSerializer,
+    WorkloadQuerySerializer,
+)
+from .snapshots import store_task_snapshot
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class CommentThreadPagination(KeysetPagination):
+    """Keyset pages over a task's comments, served by the `(task, created_at)` index."""
+
+    ordering = ("created_at", "id")
+    page_size = 50
+
+
+class TaskViewSet(ActivityHistoryMixin, SnapshotRetrieveMixin, viewsets.ModelViewSet):
     """CRUD operations for tasks with project-based permission controls."""
 
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated & IsAdminOrProjectCollaborator]
+    filterset_class = TaskFilter
+    # Board order; with `project` and `status` filters this walks the (project, status, rank) index
+    ordering = ("project", "status", *BOARD_ORDERING)
+    snapshot_cache = task_snapshots
 
     def get_queryset(self):
         user: User = self.request.user
@@ -25,21 +63,217 @@ class TaskViewSet(viewsets.ModelViewSet):
         member_project_ids = ProjectMembership.objects.filter(user=user).values_list("project_id", flat=True)
         return qs.filter(models.Q(project_id__in=member_project_ids) | models.Q(created_by=user)).distinct()
 
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    # The outbox rows commit or roll back together with the change they describe
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        task = serializer.save(created_by=self.request.user)
+        record_task_change(task, self.request.user)
+        record_created(task, self.request.user)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        previous = {"status": serializer.instance.status, "assignee_id": serializer.instance.assignee_id}
+        before = tracked_values(serializer.instance)
+        task = serializer.save()
+        record_task_change(task, self.request.user, previous)
+        record_updated(task, self.request.user, before)
+
+    def perform_destroy(self, instance):
+        Task.objects.filter(pk=instance.pk).soft_delete(updated_at=timezone.now())
+        transaction.on_commit(lambda: task_snapshots.delete(instance.pk))
+
+    def store_snapshot(self, instance, data):
+        store_task_snapshot(instance, data)
 
     @action(detail=True, methods=["get", "post"], permission_classes=[permissions.IsAuthenticated])
+    @idempotent
     def comments(self, request, pk=None):
         task = self.get_object()
         if request.method == "GET":
-            qs = task.comments.select_related("author").all()
-            return Response(CommentSerializer(qs, many=True).data)
+            # Newest page by default; `before`/`after` cursors lazy-load the rest of the thread
+            paginator = CommentThreadPagination()
+            page = paginator.paginate_queryset(task.comments.all(), request, view=self)
+            return paginator.get_paginated_response(CommentSerializer(page, many=True).data)
         # POST: create comment
-        serializer = CommentSerializer(data=request.data)
+        serializer = TaskCommentSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(task=task, author=request.user)
+        with transaction.atomic():
+            comment = serializer.save(task=task, author=request.user)
+            record_comment(comment, request.user)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"])
+    def board(self, request):
+        """Kanban board of a project: the first cards and the total of every status column.
+
+        Each column carries a `next` cursor; pass it back as `after` together with
+        `status` to load more cards of that column.
+        """
+
+        params = BoardQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        project_id, limit = params.validated_data["project"], params.validated_data["limit"]
+
+        # Same visibility as get_queryset, but without the DISTINCT that would get in
+        # the way of the window functions
+        user: User = request.user
+        tasks = Task.objects.filter(project_id=project_id)
+        if user.role != User.Roles.ADMIN and project_id not in membership_roles(user):
+            tasks = tasks.filter(created_by=user)
+
+        if "status" in params.validated_data:
+            page = column_page(tasks, params.validated_data["status"], params.validated_data.get("after"), limit)
+            page["tasks"] = TaskSerializer(page["tasks"], many=True).data
+            return Response({"project": project_id, "status": params.validated_data["status"], **page})
+
+        columns = board_columns(tasks, limit)
+        for column in columns.values():
+            column["tasks"] = TaskSerializer(column["tasks"], many=True).data
+        return Response({"project": project_id, "columns": columns})
+
+    @action(detail=False, methods=["get"])
+    def workload(self, request):
+        """Open and overdue task counts per assignee (and per project with `per_project`).
+
+        One grouped query over open tasks, which the `(assignee, status, due_date)`
+        index covers. The org-wide view (admins, no `project`) is cached for
+        `WORKLOAD_CACHE_SECONDS`.
+        """
+
+        params = WorkloadQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        project_id, per_project = params.validated_data.get("project"), params.validated_data["per_project"]
+        user: User = request.user
+        today = timezone.localdate()
+
+        org_wide = user.role == User.Roles.ADMIN and project_id is None
+        cache_key = f"workload:{today.isoformat()}:{int(per_project)}"
+        if org_wide:
+            snapshot = cache.get(cache_key)
+            record_cache("workload", snapshot is not None)
+            if snapshot is not None:
+                return Response({**snapshot, "cached": True})
+
+        tasks = Task.objects.filter(status__in=Task.OPEN_STATUSES, assignee__isnull=False)
+        if user.role != User.Roles.ADMIN:
+            tasks = tasks.filter(
+                models.Q(project_id__in=list(membership_roles(user))) | models.Q(project__created_by=user)
+            )
+        if project_id is not None:
+            tasks = tasks.filter(project_id=project_id)
+        group = ["assignee", "assignee__username", *(["project"] if per_project else [])]
+        rows = (
+            tasks.values(*group)
+            .annotate(open=models.Count("id"), overdue=models.Count("id", filter=models.Q(due_date__lt=today)))
+            .order_by("-open", *group)
+        )
+        results = [
+            {
+                "assignee": row["assignee"],
+                "username": row["assignee__username"],
+                **({"project": row["project"]} if per_project else {}),
+                "open": row["open"],
+                "overdue": row["overdue"],
+            }
+            for row in rows
+        ]
+        data = {"generated_at": timezone.now(), "results": results}
+        if org_wide:
+            cache.set(cache_key, data, settings.WORKLOAD_CACHE_SECONDS)
+        return Response({**data, "cached": False})
+
+    @action(detail=False, methods=["get"])
+    def my_tasks(self, request):
+        """Tasks assigned to the current user across projects, open ones first, by due date.
+
+        Assignment implies visibility, so this skips the membership subquery, OR and
+        DISTINCT of `get_queryset`. The `(assignee, status, due_date, id)` index finds
+        the user's rows; the default open-first order is a `CASE` expression, so those
+        rows are still sorted (one user's tasks, so a small sort). Pass `status` to list
+        a single status; on PostgreSQL that order comes straight from the index.
+        """
+
+        params = MyTasksQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        tasks = Task.objects.filter(assignee=request.user)
+        by_due_date = (models.F("due_date").asc(nulls_last=True), "id")
+        if "status" in params.validated_data:
+            tasks = tasks.filter(status=params.validated_data["status"]).order_by(*by_due_date)
+        else:
+            open_first = models.Case(models.When(status__in=Task.OPEN_STATUSES, then=0), default=1)
+            tasks = tasks.order_by(open_first, *by_due_date)
+        page = self.paginate_queryset(tasks)
+        return self.get_paginated_response(TaskSerializer(page, many=True).data)
+
+    @action(detail=True, methods=["post"])
+    def move(self, request, pk=None):
+        """Reposition the task on the board, optionally into another status column.
+
+        Only the moved task is written: its new rank is computed between its new
+        neighbours. Columns whose keys grow past `TASK_RANK_REBALANCE_LENGTH` are
+        respaced by `manage.py rebalance_task_ranks`; a column with no room left is
+        respaced inline before giving up with 409.
+        """
+
+        task = self.get_object()
+        params = TaskMoveSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        target = params.validated_data.get("status", task.status)
+        column = Task.objects.filter(project_id=task.project_id, status=target).exclude(pk=task.pk)
+        ranks = column.values_list("rank", flat=True)
+
+        anchor_field = "after" if "after" in params.validated_data else "before"
+        anchor = None
+        if anchor_field in params.validated_data:
+            anchor = ranks.filter(pk=params.validated_data[anchor_field]).first()
+            if anchor is None:
+                raise ValidationError({anchor_field: ["Task is not in the target column."]})
+
+        def new_rank():
+            if anchor is None:
+                return rank_before(ranks.order_by("rank").first())
+            if anchor_field == "after":
+                return rank_between(anchor, ranks.filter(rank__gt=anchor).order_by("rank").first())
+            return rank_between(ranks.filter(rank__lt=anchor).order_by("-rank").first(), anchor)
+
+        try:
+            rank = new_rank()
+        except ValueError:
+            rebalance_column(task.project_id, target)
+            if anchor is not None:
+                anchor = ranks.filter(pk=params.validated_data[anchor_field]).first()
+            try:
+                rank = new_rank()
+            except ValueError:
+                return Response(
+                    {"detail": "Column ranks need rebalancing; please retry."}, status=status.HTTP_409_CONFLICT
+                )
+
+        previous = {"status": task.status, "assignee_id": task.assignee_id}
+        before = tracked_values(task)
+        task.status, task.rank = target, rank
+        with transaction.atomic():
+            task.save(update_fields=["status", "rank", "updated_at"])
+            if task.status != previous["status"]:
+                record_task_change(task, request.user, previous)
+            record_updated(task, request.user, before)
+        return Response(TaskSerializer(task).data)
+
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser, FormParser])
+    def import_file(self, request):
+        """Bulk-create tasks from an uploaded CSV or NDJSON `file`.
+
+        Rows referencing projects the user cannot write to are reported as errors.
+        """
+
+        if request.user.role == User.Roles.VIEWER:
+            raise PermissionDenied("Viewers cannot import tasks.")
+        return import_upload(TaskImporter(request.user), request)
+
 
 class CommentViewSet(viewsets.ModelViewSet):
     """Manage comments as a separate endpoint if needed."""
@@ -49,7 +283,8 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user: User = self.request.user
-        qs = Comment.objects.select_related("task", "author", "task__project")
+        # Comments of soft-deleted tasks disappear with them until they are purged
+        qs = Comment.objects.filter(task__deleted_at__isnull=True).select_related("task", "author", "task__project")
         if user.role == User.Roles.ADMIN:
             return qs
         member_project_ids = ProjectMembership.objects.filter(user=user).values_list("project_id", flat=True)
@@ -57,3 +292,8 @@ class CommentViewSet(viewsets.ModelViewSet):
             models.Q(task__project_id__in=member_project_ids) | models.Q(author=user)
         ).distinct()
 
+    @transaction.atomic
+    def perform_create(self, serializer):
+        comment = serializer.save(author=self.request.user)
+        record_comment(comment, self.request.user)
+